@@ -1,15 +1,222 @@
+from typing import Callable, Optional
+
+from django import forms
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.utils import quote, unquote
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import PermissionDenied
+from django.db.models import Model, Q
+from django.db.models.query import QuerySet
+from django.forms.models import BaseModelFormSet
+from django.http import Http404, HttpRequest
+from django.template.response import TemplateResponse
+from django.urls import URLPattern, path, reverse
 
+from blog.choices import Choices, category_choices, location_choices
+from blog.constants import RELATED_POSTS_ON_PAGE
 from blog.models import Category, Comment, Location, Post
+from blog.paginators import CursorPaginator, InvalidCursor
+from core.bulk import bulk_update
+
+
+class CategoryActionForm(forms.Form):
+    category = forms.TypedChoiceField(
+        label='Категория', choices=category_choices, coerce=int
+    )
+
+
+@admin.action(description='Опубликовать выбранные', permissions=('change',))
+def publish(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+) -> None:
+    updated = bulk_update(queryset, is_published=True)
+    modeladmin.message_user(request, f'Опубликовано: {updated}.')
+
+
+@admin.action(
+    description='Снять с публикации выбранные', permissions=('change',)
+)
+def unpublish(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+) -> None:
+    updated = bulk_update(queryset, is_published=False)
+    modeladmin.message_user(request, f'Снято с публикации: {updated}.')
+
+
+@admin.action(
+    description='Перенести выбранные в категорию', permissions=('change',)
+)
+def move_to_category(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+) -> Optional[TemplateResponse]:
+    form = CategoryActionForm(
+        request.POST if 'apply' in request.POST else None
+    )
+    if form.is_valid():
+        updated = bulk_update(queryset, category=form.cleaned_data['category'])
+        modeladmin.message_user(request, f'Перенесено: {updated}.')
+        return None
+    return TemplateResponse(
+        request,
+        'admin/blog/move_to_category.html',
+        {
+            **modeladmin.admin_site.each_context(request),
+            'title': 'Перенос в категорию',
+            'opts': modeladmin.model._meta,
+            'form': form,
+            'count': queryset.count(),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across', '0'),
+        },
+    )
+
+
+@admin.action(
+    description='Убрать местоположение у выбранных', permissions=('change',)
+)
+def clear_location(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+) -> None:
+    updated = bulk_update(queryset, location=None)
+    modeladmin.message_user(request, f'Местоположение убрано: {updated}.')
+
 
+class CachedLabelsAutocompleteSelect(AutocompleteSelect):
+    """Autocomplete select labelling the selected option from a dict.
 
-class PostInline(admin.StackedInline):
-    model = Post
-    extra = 0
+    The plain widget queries the label of its value on every render.
+    """
+
+    def __init__(self, *args, labels: dict[str, str], **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.labels = labels
+
+    def optgroups(
+        self, name: str, value: list[str], attrs: Optional[dict] = None
+    ) -> list[tuple[None, list[dict], int]]:
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        for selected in value:
+            if selected in self.labels:
+                options.append(
+                    self.create_option(
+                        name,
+                        selected,
+                        self.labels[selected],
+                        True,
+                        len(options),
+                    )
+                )
+        return [(None, options, 0)]
+
+
+class CachedChoicesMixin:
+    """Mixin labelling list_editable autocomplete fields from cache.
+
+    Every changelist row would otherwise query the label of each of its
+    foreign keys. Rows share one cached choice list instead.
+    """
+
+    cached_choices: dict[str, Callable[[], Choices]] = {}
+
+    def get_changelist_formset(
+        self, request: HttpRequest, **kwargs
+    ) -> type[BaseModelFormSet]:
+        formset = super().get_changelist_formset(request, **kwargs)
+        for name, get_choices in self.cached_choices.items():
+            field = formset.form.base_fields.get(name)
+            if field is None:
+                continue
+            # Admin wraps the widget to add links to related objects.
+            wrapper = field.widget
+            widget = wrapper.widget
+            wrapper.widget = CachedLabelsAutocompleteSelect(
+                widget.field,
+                widget.admin_site,
+                attrs=widget.attrs,
+                choices=widget.choices,
+                using=widget.db,
+                labels={str(pk): label for pk, label in get_choices()},
+            )
+            wrapper.widget.is_required = widget.is_required
+        return formset
+
+
+class RelatedPostsMixin:
+    """Mixin showing posts of the object on its change page on demand.
+
+    Unlike an inline, which renders a form for every post with the
+    page, posts are fetched page by page from a separate view, and
+    saving the object does not touch them.
+    """
+
+    change_form_template = 'admin/blog/related_posts_change_form.html'
+    # Foreign key of Post to the model of the admin.
+    related_posts_field: str
+
+    def get_urls(self) -> list[URLPattern]:
+        opts = self.model._meta
+        return [
+            path(
+                '<path:object_id>/posts/',
+                self.admin_site.admin_view(self.related_posts_view),
+                name=f'{opts.app_label}_{opts.model_name}_posts',
+            ),
+            *super().get_urls(),
+        ]
+
+    def related_posts_view(
+        self, request: HttpRequest, object_id: str
+    ) -> TemplateResponse:
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404
+        if not (
+            self.has_view_or_change_permission(request, obj)
+            and self.admin_site._registry[Post].has_view_permission(request)
+        ):
+            raise PermissionDenied
+        paginator = CursorPaginator(
+            Post.objects.filter(**{self.related_posts_field: obj}).only(
+                'title', 'pub_date', 'is_published'
+            ),
+            RELATED_POSTS_ON_PAGE,
+        )
+        try:
+            posts = paginator.page(request.GET.get('cursor'))
+        except InvalidCursor as error:
+            raise Http404(str(error)) from error
+        return TemplateResponse(
+            request,
+            'admin/blog/related_posts.html',
+            {'posts': posts, 'url': request.path},
+        )
+
+    def render_change_form(
+        self,
+        request: HttpRequest,
+        context: dict,
+        *args,
+        obj: Optional[Model] = None,
+        **kwargs,
+    ) -> TemplateResponse:
+        if obj is not None:
+            opts = self.model._meta
+            context['related_posts_url'] = reverse(
+                f'admin:{opts.app_label}_{opts.model_name}_posts',
+                args=(quote(obj.pk),),
+                current_app=self.admin_site.name,
+            )
+        return super().render_change_form(
+            request, context, *args, obj=obj, **kwargs
+        )
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(RelatedPostsMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'is_published',
@@ -17,11 +224,12 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display_links = ('title',)
     list_editable = ('is_published',)
     search_fields = ('title',)
-    inlines = (PostInline,)
+    actions = (publish, unpublish)
+    related_posts_field = 'category'
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(RelatedPostsMixin, admin.ModelAdmin):
     list_display = (
         'name',
         'is_published',
@@ -29,11 +237,12 @@ class LocationAdmin(admin.ModelAdmin):
     list_display_links = ('name',)
     list_editable = ('is_published',)
     search_fields = ('name',)
-    inlines = (PostInline,)
+    actions = (publish, unpublish)
+    related_posts_field = 'location'
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(CachedChoicesMixin, admin.ModelAdmin):
     list_display = (
         'id',
         'title',
@@ -42,11 +251,32 @@ class PostAdmin(admin.ModelAdmin):
         'pub_date',
         'category',
         'location',
+        'comment_count',
     )
     list_display_links = ('id', 'title')
     list_editable = ('is_published', 'category', 'location')
     list_filter = ('category', 'location')
+    list_select_related = ('author', 'category', 'location')
+    autocomplete_fields = ('author', 'category', 'location')
+    cached_choices = {
+        'category': category_choices,
+        'location': location_choices,
+    }
+    # Titles and texts are searched in the full-text index, see
+    # get_search_results.
     search_fields = ('title', 'text', 'author__username')
+    actions = (publish, unpublish, move_to_category, clear_location)
+
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet, search_term: str
+    ) -> tuple[QuerySet, bool]:
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        matching = Post.objects.search(search_term).values('pk')
+        return queryset.filter(
+            Q(pk__in=matching) | Q(author__username__istartswith=search_term)
+        ), False
 
 
 @admin.register(Comment)
@@ -54,4 +284,7 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ('id', 'author', 'created_at', 'is_published', 'post')
     list_display_links = ('id',)
     list_editable = ('is_published',)
+    list_select_related = ('author', 'post')
+    autocomplete_fields = ('author', 'post')
     search_fields = ('author__username',)
+    actions = (publish, unpublish)
@@ -0,0 +1,342 @@
+import argparse
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Optional
+
+import django
+from django.conf import settings
+from django.db import connection, reset_queries
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.constants import POSTS_ON_PAGE
+from blog.generator import DataGenerator, Scale
+from blog.models import Category, Post, PostQuerySet
+from core.benchmark import percentile, scratch_database
+
+# Keeps debug toolbar out of the measured requests.
+CLIENT_DEFAULTS = {'HTTP_HOST': 'localhost', 'REMOTE_ADDR': '10.0.0.1'}
+
+# The gate compares confidence intervals of p95 over repeats, which
+# need two samples at least.
+MIN_REPEATS = 2
+DEFAULT_REPEATS = 5
+
+
+def parse_sizes(value: str) -> list[int]:
+    return [int(size) for size in value.split(',')]
+
+
+def parse_repeats(value: str) -> int:
+    repeats = int(value)
+    if repeats < MIN_REPEATS:
+        raise argparse.ArgumentTypeError(
+            f'at least {MIN_REPEATS} repeats are needed to compare runs'
+        )
+    return repeats
+
+
+@dataclass
+class Targets:
+    """Objects the benchmarked urls point to."""
+
+    category: Category
+    post: Post
+
+
+@dataclass
+class ViewCase:
+    """Single url requested by an anonymous or logged in client.
+
+    Pages for anonymous users are rendered on every request, unless
+    page_cached is set and the case measures hits of the page cache.
+    """
+
+    name: str
+    url_name: str
+    get_kwargs: Callable[[Targets], dict[str, Any]]
+    authenticated: bool = False
+    page_cached: bool = False
+    method: str = 'get'
+    data: Optional[dict[str, str]] = None
+
+
+@dataclass
+class QuerysetCase:
+    """Post queryset fetched one page at a time."""
+
+    name: str
+    get_queryset: Callable[[Targets], PostQuerySet]
+
+
+VIEW_CASES = (
+    ViewCase('index', 'blog:index', lambda targets: {}),
+    ViewCase('index', 'blog:index', lambda targets: {}, page_cached=True),
+    ViewCase('index', 'blog:index', lambda targets: {}, authenticated=True),
+    ViewCase(
+        'category_posts',
+        'blog:category_posts',
+        lambda targets: {'category_slug': targets.category.slug},
+    ),
+    ViewCase(
+        'category_posts',
+        'blog:category_posts',
+        lambda targets: {'category_slug': targets.category.slug},
+        page_cached=True,
+    ),
+    ViewCase(
+        'post_detail',
+        'blog:post_detail',
+        lambda targets: {'post_id': targets.post.pk},
+    ),
+    ViewCase(
+        'post_detail',
+        'blog:post_detail',
+        lambda targets: {'post_id': targets.post.pk},
+        page_cached=True,
+    ),
+    ViewCase(
+        'post_detail',
+        'blog:post_detail',
+        lambda targets: {'post_id': targets.post.pk},
+        authenticated=True,
+    ),
+    ViewCase(
+        'profile',
+        'blog:profile',
+        lambda targets: {'username': targets.post.author.username},
+        authenticated=True,
+    ),
+    ViewCase(
+        'add_comment',
+        'blog:add_comment',
+        lambda targets: {'post_id': targets.post.pk},
+        authenticated=True,
+        method='post',
+        data={'text': 'Benchmark comment'},
+    ),
+    ViewCase(
+        'edit_post',
+        'blog:edit_post',
+        lambda targets: {'post_id': targets.post.pk},
+        authenticated=True,
+    ),
+)
+
+
+QUERYSET_CASES = (
+    QuerysetCase(
+        'published_feed',
+        lambda targets: Post.objects.select_all_related().get_published(),
+    ),
+    QuerysetCase(
+        'category_feed',
+        lambda targets: Post.objects.select_all_related()
+        .get_published()
+        .filter(category=targets.category),
+    ),
+    QuerysetCase(
+        'author_feed',
+        lambda targets: Post.objects.select_all_related().get_by_author(
+            targets.post.author, targets.post.author
+        ),
+    ),
+    QuerysetCase(
+        'visible_post',
+        lambda targets: Post.objects.select_all_related()
+        .get_all_for_user(targets.post.author)
+        .filter(pk=targets.post.pk),
+    ),
+)
+
+
+def find_targets() -> Targets:
+    """Pick the busiest published category and the most discussed post."""
+    category = (
+        Category.objects.filter(is_published=True)
+        .annotate(post_count=Count('posts'))
+        .order_by('-post_count')
+        .first()
+    )
+    post = (
+        Post.objects.get_published()
+        .select_related('author')
+        .order_by('-comment_count')
+        .first()
+    )
+    return Targets(category=category, post=post)
+
+
+def measure(
+    func: Callable[[], object], requests: int, warmup: int
+) -> dict[str, Any]:
+    """Call func repeatedly and return latency, queries and memory."""
+    for _ in range(warmup):
+        func()
+
+    # The query log may already be full after migrations and is cleared
+    # when the next request starts, so it is read right away.
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    query_count = len(queries)
+
+    tracemalloc.start()
+    func()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': requests,
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+        'p99_ms': percentile(timings, 99),
+        'rps': requests / elapsed,
+        'queries': query_count,
+        'peak_memory_kb': peak_memory / 1024,
+    }
+
+
+def measure_case(
+    case: ViewCase, targets: Targets, requests: int, warmup: int
+) -> dict[str, Any]:
+    """Request the url of the case and return its statistics."""
+    client = Client(**CLIENT_DEFAULTS)
+    if case.authenticated:
+        client.force_login(targets.post.author)
+    url = reverse(case.url_name, kwargs=case.get_kwargs(targets))
+
+    def request() -> int:
+        return getattr(client, case.method)(url, case.data).status_code
+
+    page_cache_timeout = settings.PAGE_CACHE_TIMEOUT if case.page_cached else 0
+    with override_settings(PAGE_CACHE_TIMEOUT=page_cache_timeout):
+        return {
+            'kind': 'view',
+            'case': case.name,
+            'url_name': case.url_name,
+            'method': case.method.upper(),
+            'authenticated': case.authenticated,
+            'page_cached': case.page_cached,
+            'status_code': request(),
+            **measure(request, requests, warmup),
+        }
+
+
+def measure_queryset_case(
+    case: QuerysetCase, targets: Targets, requests: int, warmup: int
+) -> dict[str, Any]:
+    """Fetch a page of the queryset of the case and return its statistics."""
+    return {
+        'kind': 'queryset',
+        'case': case.name,
+        **measure(
+            lambda: list(case.get_queryset(targets)[:POSTS_ON_PAGE]),
+            requests,
+            warmup,
+        ),
+    }
+
+
+def result_key(result: dict[str, Any]) -> str:
+    """Return identifier of a result used to match it with a baseline."""
+    parts = [str(result['size']), result['kind'], result['case']]
+    if result['kind'] == 'view':
+        parts.append('auth' if result['authenticated'] else 'anon')
+        if result.get('page_cached'):
+            parts.append('cached')
+    return '/'.join(parts)
+
+
+def aggregate_repeats(repeats: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge results of one case measured several times.
+
+    Medians of the repeats are reported and the p95 of every repeat is
+    kept, so a later comparison can compute a confidence interval.
+    """
+    result = dict(repeats[0])
+    for name in ('p50_ms', 'p95_ms', 'p99_ms', 'rps', 'peak_memory_kb'):
+        result[name] = statistics.median(repeat[name] for repeat in repeats)
+    result['queries'] = max(repeat['queries'] for repeat in repeats)
+    result['p95_samples'] = [repeat['p95_ms'] for repeat in repeats]
+    result['key'] = result_key(result)
+    return result
+
+
+def run_benchmarks(
+    sizes: Iterable[int],
+    requests: int,
+    repeats: int = 1,
+    warmup: int = 5,
+    seed: int = 0,
+    log: Callable[[str], None] = lambda message: None,
+) -> list[dict[str, Any]]:
+    """Benchmark every view and queryset case on scratch databases.
+
+    A database is generated for each of the given post counts and every
+    case is measured repeats times on it.
+    """
+    results = []
+    for size in sizes:
+        with scratch_database(), override_settings(DEBUG=False):
+            log(f'Generating {size} posts...')
+            DataGenerator(
+                Scale(posts=size, users=max(10, size // 50), seed=seed)
+            ).generate()
+            targets = find_targets()
+            measure_funcs = [
+                *(partial(measure_case, case) for case in VIEW_CASES),
+                *(
+                    partial(measure_queryset_case, case)
+                    for case in QUERYSET_CASES
+                ),
+            ]
+            measurements = [[] for _ in measure_funcs]
+            for _ in range(repeats):
+                for func, repeated in zip(measure_funcs, measurements):
+                    repeated.append(func(targets, requests, warmup))
+            for repeated in measurements:
+                result = aggregate_repeats(
+                    [dict(repeat, size=size) for repeat in repeated]
+                )
+                results.append(result)
+                log(
+                    f'{result["key"]:<40}'
+                    f' p50 {result["p50_ms"]:7.2f} ms'
+                    f' p95 {result["p95_ms"]:7.2f} ms'
+                    f' {result["rps"]:8.1f} rps'
+                    f' {result["queries"]:3} queries'
+                )
+    return results
+
+
+def make_report(
+    results: list[dict[str, Any]], options: dict[str, Any]
+) -> dict[str, Any]:
+    """Wrap results with the environment and options they were made with."""
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'options': {
+            name: options[name]
+            for name in ('sizes', 'requests', 'repeats', 'warmup', 'seed')
+        },
+        'results': results,
+    }
@@ -0,0 +1,48 @@
+from collections.abc import Iterable
+
+from blog.models import Post
+
+# Changes whenever the set of published posts may change.
+POSTS = 'posts'
+# Changes whenever anything shown in post lists changes.
+CONTENT = 'content'
+# Changes whenever some user is renamed.
+USERNAMES = 'usernames'
+# Change whenever some category or location changes.
+CATEGORIES = 'categories'
+LOCATIONS = 'locations'
+
+
+def category_posts(category_id: int) -> str:
+    return f'category_posts:{category_id}'
+
+
+def post(post_id: int) -> str:
+    return f'post:{post_id}'
+
+
+def category(category_id: int) -> str:
+    return f'category:{category_id}'
+
+
+def location(location_id: int) -> str:
+    return f'location:{location_id}'
+
+
+def user(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+def post_dependencies(posts: Iterable[Post]) -> list[str]:
+    """Return names of objects rendered in the cards of posts."""
+    dependencies = set()
+    for rendered_post in posts:
+        dependencies.update(
+            (
+                post(rendered_post.pk),
+                category(rendered_post.category_id),
+                location(rendered_post.location_id),
+                user(rendered_post.author_id),
+            )
+        )
+    return sorted(dependencies)
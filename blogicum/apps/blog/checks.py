@@ -0,0 +1,48 @@
+from typing import Optional
+
+from django.apps import AppConfig
+from django.core.checks import Error, Tags, register
+from django.db import connections
+
+from blog.search import POST_SEARCH_TABLE, POST_SEARCH_TRIGGERS
+
+
+@register(Tags.database)
+def check_search_triggers(
+    app_configs: Optional[list[AppConfig]],
+    databases: Optional[list[str]] = None,
+    **kwargs,
+) -> list[Error]:
+    """Find search indexes which are no longer updated by triggers.
+
+    Migrations which remake blog_post on SQLite drop its triggers
+    silently, and search stops seeing new and changed posts.
+    """
+    errors = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT name FROM sqlite_master'
+                " WHERE type = 'trigger' OR name = %s",
+                [POST_SEARCH_TABLE],
+            )
+            names = {name for (name,) in cursor.fetchall()}
+        if POST_SEARCH_TABLE not in names:
+            continue
+        errors.extend(
+            Error(
+                f'Trigger {trigger} of the search index is missing'
+                f' in database {alias!r}.',
+                hint=(
+                    'A migration remade blog_post. Create the trigger again'
+                    ' as in migration 0015 and rebuild the index.'
+                ),
+                id='blog.E001',
+            )
+            for trigger in POST_SEARCH_TRIGGERS
+            if trigger not in names
+        )
+    return errors
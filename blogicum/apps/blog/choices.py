@@ -0,0 +1,35 @@
+from django.db.models import Model
+
+from blog import cache
+from blog.models import Category, Location
+from core.cache import get_or_compute
+
+CHOICES_KEY_PREFIX = 'choices'
+
+Choices = list[tuple[int, str]]
+
+
+def _cached_choices(
+    model: type[Model], dependency: str, published_only: bool
+) -> Choices:
+    def compute() -> Choices:
+        queryset = model.objects.all()
+        if published_only:
+            queryset = queryset.filter(is_published=True)
+        return [(obj.pk, str(obj)) for obj in queryset]
+
+    return get_or_compute(
+        f'{CHOICES_KEY_PREFIX}:{model._meta.label_lower}:{published_only:d}',
+        [dependency],
+        compute,
+    )
+
+
+def category_choices(published_only: bool = False) -> Choices:
+    """Return (pk, title) of categories, cached until one changes."""
+    return _cached_choices(Category, cache.CATEGORIES, published_only)
+
+
+def location_choices(published_only: bool = False) -> Choices:
+    """Return (pk, name) of locations, cached until one changes."""
+    return _cached_choices(Location, cache.LOCATIONS, published_only)
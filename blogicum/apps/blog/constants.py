@@ -1 +1,10 @@
 POSTS_ON_PAGE = 10
+# Posts loaded at once on change pages of categories and locations in admin.
+RELATED_POSTS_ON_PAGE = 50
+
+OFFSET_PAGINATION = 'offset'
+CURSOR_PAGINATION = 'cursor'
+
+EXCERPT_WORDS = 10
+# Words in fragments of matching posts shown by search.
+SEARCH_SNIPPET_WORDS = 20
@@ -1,6 +1,11 @@
+from functools import partial
+from typing import Callable, Optional, Union
+
 import django.forms as forms
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 
+from blog.choices import Choices, category_choices, location_choices
 from blog.models import Comment, Post
 
 User = get_user_model()
@@ -24,6 +29,14 @@ class CommentForm(forms.ModelForm):
 
 
 class PostForm(forms.ModelForm):
+    # Options are rendered from cached lists instead of a query on every
+    # render. Unpublished categories and locations are neither shown nor
+    # accepted, except the ones the edited post already has.
+    cached_choices: dict[str, Callable[[], Choices]] = {
+        'category': partial(category_choices, published_only=True),
+        'location': partial(location_choices, published_only=True),
+    }
+
     class Meta:
         model = Post
         fields = ('title', 'text', 'pub_date', 'location', 'category', 'image')
@@ -33,3 +46,36 @@ class PostForm(forms.ModelForm):
                 format='%Y-%m-%d %H:%M',
             )
         }
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        for name, get_choices in self.cached_choices.items():
+            field = self.fields[name]
+            allowed = Q(is_published=True)
+            current = self._current_pk(name)
+            if current is not None:
+                allowed |= Q(pk=current)
+            field.queryset = field.queryset.filter(allowed)
+            # Callable choices are lazy, so nothing is read until render.
+            field.choices = partial(self._cached_choices, name, get_choices)
+
+    def _current_pk(self, name: str) -> Optional[int]:
+        attname = self.instance._meta.get_field(name).attname
+        return getattr(self.instance, attname)
+
+    def _cached_choices(
+        self, name: str, get_choices: Callable[[], Choices]
+    ) -> list[tuple[Union[int, str], str]]:
+        """Return cached choices with the current value of the post.
+
+        The current value is kept even when it is unpublished, so saving
+        the form does not move the post out of it.
+        """
+        choices: list[tuple[Union[int, str], str]] = list(get_choices())
+        current = self._current_pk(name)
+        if current is not None and all(pk != current for pk, _ in choices):
+            choices.insert(0, (current, str(getattr(self.instance, name))))
+        empty_label = self.fields[name].empty_label
+        if empty_label is not None:
+            choices.insert(0, ('', empty_label))
+        return choices
@@ -0,0 +1,212 @@
+import itertools
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, make_excerpt
+from core.cache import bump_all
+from core.utils import batched
+
+User = get_user_model()
+
+WORDS = (
+    'путешествие город море горы река лес утро вечер дорога поезд'
+    ' кофе книга музыка друг история фото день ночь дом солнце дождь'
+    ' снег ветер небо мост улица парк python django код тест база'
+).split()
+
+
+@dataclass
+class Scale:
+    """Sizes and shapes of the generated dataset."""
+
+    users: int = 100
+    categories: int = 10
+    locations: int = 20
+    posts: int = 1000
+    comments_per_post: float = 3.0
+    unpublished_share: float = 0.05
+    future_share: float = 0.05
+    unpublished_category_share: float = 0.1
+    text_words: int = 60
+    days: int = 365
+    # Zipf exponent of posts per author: 0 is uniform.
+    author_skew: float = 1.0
+    # Tail of comments per post: must be positive, higher is heavier.
+    comment_skew: float = 1.2
+    prefix: str = 'gen'
+    seed: int = 0
+    batch_size: int = 5000
+
+
+def zipf_weights(size: int, skew: float) -> list[float]:
+    """Return cumulative weights of ranks 1..size for random.choices."""
+    return list(
+        itertools.accumulate(1 / rank**skew for rank in range(1, size + 1))
+    )
+
+
+class DataGenerator:
+    """Generate reproducible blog data of the given scale.
+
+    Objects are inserted with bulk_create, so the generator fills
+    fields which are normally maintained by save() itself.
+    """
+
+    def __init__(
+        self, scale: Scale, log: Optional[Callable[[str], None]] = None
+    ) -> None:
+        self.scale = scale
+        self.rng = random.Random(scale.seed)
+        self.log = log or (lambda message: None)
+
+    def generate(self) -> None:
+        with transaction.atomic():
+            user_ids = self.create_users()
+            category_ids = self.create_categories()
+            location_ids = self.create_locations()
+            comment_counts = self.create_posts(
+                user_ids, category_ids, location_ids
+            )
+            self.create_comments(user_ids, comment_counts)
+        # Rows may reuse primary keys of deleted ones, so versions of
+        # single posts, categories, locations and users change too.
+        bump_all()
+
+    def _insert(
+        self,
+        model: type,
+        objects: Iterator,
+        name: str,
+        return_ids: bool = True,
+    ) -> list[int]:
+        """Insert objects in batches and return their ids in order."""
+        last_pk = (
+            model.objects.order_by('-pk').values_list('pk', flat=True).first()
+            or 0
+        )
+        inserted = 0
+        for batch in batched(objects, self.scale.batch_size):
+            model.objects.bulk_create(batch)
+            inserted += len(batch)
+            self.log(f'{name}: {inserted}')
+        if not return_ids:
+            return []
+        return list(
+            model.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+
+    def _text(self, words: int) -> str:
+        return ' '.join(self.rng.choices(WORDS, k=max(1, words)))
+
+    def create_users(self) -> list[int]:
+        password = make_password(None)
+        return self._insert(
+            User,
+            (
+                User(
+                    username=f'{self.scale.prefix}_user{number}',
+                    password=password,
+                )
+                for number in range(self.scale.users)
+            ),
+            'users',
+        )
+
+    def create_categories(self) -> list[int]:
+        return self._insert(
+            Category,
+            (
+                Category(
+                    title=f'Категория {number}',
+                    slug=f'{self.scale.prefix}-category-{number}',
+                    description=self._text(20),
+                    is_published=self.rng.random()
+                    >= self.scale.unpublished_category_share,
+                )
+                for number in range(self.scale.categories)
+            ),
+            'categories',
+        )
+
+    def create_locations(self) -> list[int]:
+        return self._insert(
+            Location,
+            (
+                Location(name=f'Место {number}')
+                for number in range(self.scale.locations)
+            ),
+            'locations',
+        )
+
+    def create_posts(
+        self,
+        user_ids: list[int],
+        category_ids: list[int],
+        location_ids: list[int],
+    ) -> dict[int, int]:
+        """Insert posts and return number of comments for each of them."""
+        scale = self.scale
+        now = timezone.now()
+        author_weights = zipf_weights(len(user_ids), scale.author_skew)
+        location_choices = [None, *location_ids]
+        comment_counts = []
+
+        def make_posts() -> Iterator[Post]:
+            for number in range(scale.posts):
+                if self.rng.random() < scale.future_share:
+                    pub_date = now + timedelta(
+                        minutes=self.rng.randint(1, 60 * 24 * 30)
+                    )
+                else:
+                    pub_date = now - timedelta(
+                        minutes=self.rng.randint(0, 60 * 24 * scale.days)
+                    )
+                text = self._text(
+                    int(self.rng.expovariate(1 / scale.text_words))
+                )
+                comment_count = round(
+                    scale.comments_per_post
+                    * (self.rng.paretovariate(1 + 1 / scale.comment_skew) - 1)
+                    / scale.comment_skew
+                )
+                comment_counts.append(comment_count)
+                yield Post(
+                    title=f'Пост {number}: {self._text(4)}',
+                    text=text,
+                    excerpt=make_excerpt(text),
+                    pub_date=pub_date,
+                    is_published=self.rng.random() >= scale.unpublished_share,
+                    author_id=self.rng.choices(
+                        user_ids, cum_weights=author_weights
+                    )[0],
+                    category_id=self.rng.choice(category_ids),
+                    location_id=self.rng.choice(location_choices),
+                    comment_count=comment_count,
+                )
+
+        post_ids = self._insert(Post, make_posts(), 'posts')
+        return dict(zip(post_ids, comment_counts))
+
+    def create_comments(
+        self, user_ids: list[int], comment_counts: dict[int, int]
+    ) -> None:
+        def make_comments() -> Iterator[Comment]:
+            for post_id, count in comment_counts.items():
+                for _ in range(count):
+                    yield Comment(
+                        post_id=post_id,
+                        author_id=self.rng.choice(user_ids),
+                        text=self._text(self.rng.randint(3, 30)),
+                    )
+
+        self._insert(Comment, make_comments(), 'comments', return_ids=False)
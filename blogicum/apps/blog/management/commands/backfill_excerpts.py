@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from blog.models import Post
+from core.cache import bump_all
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored excerpts of posts from their text.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of posts updated with a single query.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        updated = Post.objects.update_excerpts(options['batch_size'])
+        if updated:
+            # Posts are updated without save() and its signals, and cards
+            # of every post show excerpts.
+            bump_all()
+        self.stdout.write(
+            self.style.SUCCESS(f'Excerpts updated for {updated} posts.')
+        )
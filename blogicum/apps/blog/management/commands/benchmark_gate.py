@@ -0,0 +1,101 @@
+import json
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from blog.benchmarks import (
+    DEFAULT_REPEATS,
+    MIN_REPEATS,
+    make_report,
+    parse_repeats,
+    parse_sizes,
+    run_benchmarks,
+)
+from core.benchmark import find_regressions
+
+
+class Command(BaseCommand):
+    help = (
+        'Rerun the view and queryset benchmarks and fail if p95 latency'
+        ' or query count regressed against a baseline made by'
+        ' benchmark_views.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('baseline', help='Path of baseline JSON file.')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.1,
+            help='Allowed relative growth of p95 latency.',
+        )
+        parser.add_argument(
+            '--query-threshold',
+            type=int,
+            default=0,
+            help='Allowed growth of query count.',
+        )
+        parser.add_argument(
+            '--sizes',
+            type=parse_sizes,
+            help='Comma separated numbers of generated posts.'
+            ' Defaults to the sizes of the baseline.',
+        )
+        parser.add_argument('--requests', type=int)
+        parser.add_argument(
+            '--repeats', type=parse_repeats, default=DEFAULT_REPEATS
+        )
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--seed', type=int)
+        parser.add_argument('--output', help='Save current results here.')
+
+    def handle(self, *args, **options) -> None:
+        try:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Cannot read baseline: {error}')
+        if any(
+            len(result['p95_samples']) < MIN_REPEATS
+            for result in baseline['results']
+        ):
+            raise CommandError(
+                f'Baseline has fewer than {MIN_REPEATS} samples per result,'
+                ' rerun benchmark_views with more --repeats.'
+            )
+        for name in ('sizes', 'requests', 'seed'):
+            if options[name] is None:
+                options[name] = baseline['options'][name]
+
+        results = run_benchmarks(
+            options['sizes'],
+            options['requests'],
+            repeats=options['repeats'],
+            warmup=options['warmup'],
+            seed=options['seed'],
+            log=self.stdout.write,
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(make_report(results, options), file, indent=2)
+
+        baseline_keys = {result['key'] for result in baseline['results']}
+        for result in results:
+            if result['key'] not in baseline_keys:
+                self.stdout.write(f'Not in baseline: {result["key"]}')
+
+        regressions = find_regressions(
+            baseline['results'],
+            results,
+            options['threshold'],
+            options['query_threshold'],
+        )
+        if regressions:
+            raise CommandError(
+                'Benchmarks regressed:\n'
+                + '\n'.join(f'  {regression}' for regression in regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('No regressions found.'))
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import OperationalError, connection, connections
+from django.http import HttpResponse
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.benchmarks import CLIENT_DEFAULTS
+from blog.generator import DataGenerator, Scale
+from blog.models import Post
+from core.benchmark import percentile, scratch_database
+
+User = get_user_model()
+
+DEFAULT = 'default'
+TUNED = 'tuned'
+TUNED_QUEUE = 'tuned+queue'
+MODES = (DEFAULT, TUNED, TUNED_QUEUE)
+
+
+def make_clients(count: int) -> list[Client]:
+    """Return clients logged in as the first count users."""
+    clients = []
+    for user in User.objects.order_by('pk')[:count]:
+        client = Client(**CLIENT_DEFAULTS)
+        client.force_login(user)
+        clients.append(client)
+    return clients
+
+
+def repeat_until(
+    request: Callable[[], HttpResponse], deadline: float
+) -> tuple[list[float], Counter]:
+    """Repeat the request until deadline.
+
+    Return timings of successful requests in milliseconds and counts of
+    errors by message.
+    """
+    timings = []
+    errors = Counter()
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            response = request()
+        except OperationalError as error:
+            errors[str(error)] += 1
+            continue
+        if response.status_code >= 500:
+            errors[f'HTTP {response.status_code}'] += 1
+            continue
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, errors
+
+
+class Command(BaseCommand):
+    help = (
+        'Run concurrent readers of the post list and comment writers on'
+        ' SQLite database files with default settings, with pragmas and'
+        ' with pragmas and the writer queue.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument(
+            '--modes',
+            type=lambda value: value.split(','),
+            default=list(MODES),
+            help=f'Comma separated modes: {", ".join(MODES)}.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        configured_options = connection.settings_dict['OPTIONS']
+        with TemporaryDirectory() as directory, override_settings(DEBUG=False):
+            for number, mode in enumerate(options['modes']):
+                connection.settings_dict['OPTIONS'] = (
+                    {}
+                    if mode == DEFAULT
+                    else {
+                        **configured_options,
+                        'serialize_writes': mode == TUNED_QUEUE,
+                    }
+                )
+                try:
+                    with scratch_database(
+                        name=str(Path(directory) / f'{number}.sqlite3')
+                    ):
+                        results = self.run_mode(options)
+                finally:
+                    connection.settings_dict['OPTIONS'] = configured_options
+                self.report(mode, results, options['seconds'])
+
+    def run_mode(self, options: dict) -> dict[str, list]:
+        DataGenerator(
+            Scale(
+                posts=options['posts'],
+                users=options['readers'] + options['writers'],
+                seed=0,
+            )
+        ).generate()
+        post = Post.objects.get_published().first()
+        index_url = reverse('blog:index')
+        comment_url = reverse('blog:add_comment', args=(post.pk,))
+        clients = make_clients(options['readers'] + options['writers'])
+
+        results = defaultdict(list)
+        deadline = time.monotonic() + options['seconds']
+
+        def work(request: Callable[[], HttpResponse], kind: str) -> None:
+            try:
+                results[kind].append(repeat_until(request, deadline))
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(
+                target=work,
+                args=(partial(client.get, index_url), 'read'),
+            )
+            for client in clients[: options['readers']]
+        ] + [
+            threading.Thread(
+                target=work,
+                args=(
+                    partial(
+                        client.post,
+                        comment_url,
+                        {'text': 'Concurrent comment'},
+                    ),
+                    'write',
+                ),
+            )
+            for client in clients[options['readers'] :]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def report(self, mode: str, results: dict, seconds: float) -> None:
+        self.stdout.write(f'\n{mode}')
+        for kind in ('read', 'write'):
+            timings = [
+                timing
+                for thread_timings, _ in results[kind]
+                for timing in thread_timings
+            ]
+            errors = sum(
+                (thread_errors for _, thread_errors in results[kind]),
+                Counter(),
+            )
+            line = f'  {kind:<5} {len(timings) / seconds:8.1f} ops/s'
+            if timings:
+                line += (
+                    f'  p50 {percentile(timings, 50):7.2f} ms'
+                    f'  p95 {percentile(timings, 95):7.2f} ms'
+                )
+            line += f'  errors {sum(errors.values())}'
+            self.stdout.write(line)
+            for message, count in errors.most_common(3):
+                self.stdout.write(f'    {count} x {message}')
@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from blog.benchmarks import (
+    DEFAULT_REPEATS,
+    make_report,
+    parse_repeats,
+    parse_sizes,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark blog urls and post querysets in-process on generated'
+        ' databases and write the results as JSON.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--sizes',
+            type=parse_sizes,
+            default=[1000, 10000],
+            help='Comma separated numbers of generated posts.',
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--repeats', type=parse_repeats, default=DEFAULT_REPEATS
+        )
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output', default='bench_views.json', help='Path of JSON file.'
+        )
+
+    def handle(self, *args, **options) -> None:
+        results = run_benchmarks(
+            options['sizes'],
+            options['requests'],
+            repeats=options['repeats'],
+            warmup=options['warmup'],
+            seed=options['seed'],
+            log=self.stdout.write,
+        )
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(make_report(results, options), file, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f'Results written to {options["output"]}.')
+        )
@@ -0,0 +1,110 @@
+from functools import partial
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+
+from blog.constants import POSTS_ON_PAGE
+from blog.generator import DataGenerator, Scale
+from blog.models import Post, PostQuerySet
+from core.benchmark import scratch_database, summarize, time_calls
+from core.db import explain_query_plan
+
+User = get_user_model()
+
+
+def legacy_get_all_for_user(
+    posts: PostQuerySet, user: AbstractBaseUser
+) -> PostQuerySet:
+    """Previous implementation of PostQuerySet.get_all_for_user."""
+    published_posts = posts.get_published()
+    if user.is_authenticated:
+        published_posts |= posts.filter(author=user)
+    return published_posts
+
+
+def fetch_page(build_queryset: Callable[[], PostQuerySet]) -> list[Post]:
+    return list(build_queryset()[:POSTS_ON_PAGE])
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare old and new SQL of post visibility checks'
+        ' on a seeded scratch database.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options) -> None:
+        with scratch_database():
+            self.seed(options)
+            self.compare(options['repeat'])
+
+    def seed(self, options: dict) -> None:
+        self.stdout.write(f'Seeding {options["posts"]} posts...')
+        DataGenerator(
+            Scale(
+                users=options['users'],
+                posts=options['posts'],
+                comments_per_post=0,
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+            )
+        ).generate()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def compare(self, repeat: int) -> None:
+        author = User.objects.order_by('pk').first()
+        viewer = User.objects.order_by('-pk').first()
+        post_pk = (
+            Post.objects.filter(author=viewer)
+            .values_list('pk', flat=True)
+            .first()
+        )
+        posts = Post.objects.select_all_related()
+        cases: list[tuple[str, Callable, Callable]] = [
+            (
+                'ViewProfile, own profile',
+                lambda: legacy_get_all_for_user(posts, author).filter(
+                    author__username=author.username
+                ),
+                lambda: posts.get_by_author(author, author),
+            ),
+            (
+                'ViewProfile, other user',
+                lambda: legacy_get_all_for_user(posts, viewer).filter(
+                    author__username=author.username
+                ),
+                lambda: posts.get_by_author(author, viewer),
+            ),
+            (
+                'PostDetail',
+                lambda: legacy_get_all_for_user(posts, viewer).filter(
+                    pk=post_pk
+                ),
+                lambda: posts.get_all_for_user(viewer).filter(pk=post_pk),
+            ),
+        ]
+        for name, old_queryset, new_queryset in cases:
+            self.stdout.write(f'\n{name}')
+            for label, build_queryset in (
+                ('old', old_queryset),
+                ('new', new_queryset),
+            ):
+                timings = summarize(
+                    time_calls(partial(fetch_page, build_queryset), repeat)
+                )
+                self.stdout.write(
+                    f'  {label}: median {timings["median"]:.2f} ms,'
+                    f' p95 {timings["p95"]:.2f} ms'
+                )
+                for line in explain_query_plan(build_queryset()):
+                    self.stdout.write(f'    {line}')
@@ -0,0 +1,137 @@
+import inspect
+import re
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.query import QuerySet
+
+from blog.models import Comment, Post, PostQuerySet
+from core.db import explain_query_plan
+
+User = get_user_model()
+
+# Methods which issue UPDATE statements and are not used to fetch posts.
+WRITE_METHODS = frozenset(
+    {'change_comment_count', 'recount_comments', 'update_excerpts'}
+)
+
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+PlanCase = tuple[str, str, Callable[[], QuerySet]]
+
+# (PostQuerySet method, description, queryset shaped as in views)
+PLAN_CASES: tuple[PlanCase, ...] = (
+    (
+        'select_all_related',
+        'Index',
+        lambda: Post.objects.select_all_related().get_published(),
+    ),
+    (
+        'get_published',
+        'CategoryPosts',
+        lambda: (
+            Post.objects.select_all_related()
+            .get_published()
+            .filter(category__slug='slug')
+        ),
+    ),
+    (
+        'get_all_for_user',
+        'PostDetail',
+        lambda: (
+            Post.objects.select_all_related()
+            .get_all_for_user(User(pk=1))
+            .filter(pk=1)
+        ),
+    ),
+    (
+        'get_all_for_user',
+        'posts of any author',
+        lambda: Post.objects.get_all_for_user(User(pk=1)),
+    ),
+    (
+        'get_by_author',
+        'ViewProfile, own profile',
+        lambda: (
+            Post.objects.select_all_related().get_by_author(
+                User(pk=1), User(pk=1)
+            )
+        ),
+    ),
+    (
+        'get_by_author',
+        'ViewProfile, anonymous',
+        lambda: (
+            Post.objects.select_all_related().get_by_author(
+                User(pk=1), AnonymousUser()
+            )
+        ),
+    ),
+    (
+        'search',
+        'SearchPosts',
+        lambda: (
+            Post.objects.select_all_related()
+            .get_published()
+            .search('слово')
+            .order_by('search_rank', 'pk')
+        ),
+    ),
+    (
+        'Post.comments',
+        'PostDetail',
+        lambda: Comment.objects.filter(post=1).select_related('author'),
+    ),
+)
+
+
+def get_query_methods() -> set[str]:
+    """Return names of PostQuerySet methods which build select queries."""
+    return {
+        name
+        for name, member in vars(PostQuerySet).items()
+        if inspect.isfunction(member)
+        and not name.startswith('_')
+        and name not in WRITE_METHODS
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN QUERY PLAN for every PostQuerySet method and fail'
+        ' if any of them falls back to a full table scan.'
+    )
+
+    def handle(self, *args, **options) -> None:
+        if connection.vendor != 'sqlite':
+            raise CommandError('Query plans can be checked only on SQLite.')
+
+        missing = get_query_methods() - {case[0] for case in PLAN_CASES}
+        if missing:
+            raise CommandError(
+                'No query plan case for PostQuerySet methods: '
+                + ', '.join(sorted(missing))
+            )
+
+        failures = []
+        for method, description, build_queryset in PLAN_CASES:
+            plan = explain_query_plan(build_queryset())
+            scanned = [
+                match.group(1) for match in map(FULL_SCAN.match, plan) if match
+            ]
+            self.stdout.write(f'{method} ({description}):')
+            for line in plan:
+                self.stdout.write(f'  {line}')
+            if scanned:
+                failures.append(
+                    f'{method} ({description}) scans {", ".join(scanned)}'
+                )
+
+        if failures:
+            raise CommandError(
+                'Full table scans found:\n' + '\n'.join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS('No full table scans found.'))
@@ -0,0 +1,27 @@
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from blog.generator import DataGenerator, Scale
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate users, categories, locations, posts and comments'
+        ' for scale testing. The same seed gives the same data.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        for field in fields(Scale):
+            parser.add_argument(
+                f'--{field.name.replace("_", "-")}',
+                type=type(field.default),
+                default=field.default,
+            )
+
+    def handle(self, *args, **options) -> None:
+        scale = Scale(
+            **{field.name: options[field.name] for field in fields(Scale)}
+        )
+        DataGenerator(scale, log=self.stdout.write).generate()
+        self.stdout.write(self.style.SUCCESS('Data generated.'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Rebuild stored comment counters of all posts.'
+
+    def handle(self, *args, **options) -> None:
+        updated = Post.objects.recount_comments()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Comment counters rebuilt for {updated} posts.'
+            )
+        )
@@ -0,0 +1,72 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Indexes of foreign keys are dropped by name: AlterField would remake
+# blog_post on SQLite, dropping the triggers of the search index.
+FOREIGN_KEYS = ('author', 'category', 'location')
+
+
+def drop_foreign_key_indexes(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    for name in FOREIGN_KEYS:
+        column = Post._meta.get_field(name).column
+        schema_editor.execute(
+            schema_editor._delete_index_sql(
+                Post,
+                schema_editor._create_index_name(
+                    Post._meta.db_table, [column]
+                ),
+            )
+        )
+
+
+def create_foreign_key_indexes(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    for name in FOREIGN_KEYS:
+        schema_editor.execute(
+            schema_editor._create_index_sql(
+                Post, fields=[Post._meta.get_field(name)]
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0016_post_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_category_feed_idx',
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(
+                    drop_foreign_key_indexes, create_foreign_key_indexes
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='post',
+                    name='author',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации'),
+                ),
+                migrations.AlterField(
+                    model_name='post',
+                    name='category',
+                    field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='blog.category', verbose_name='Категория'),
+                ),
+                migrations.AlterField(
+                    model_name='post',
+                    name='location',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='blog.location', verbose_name='Местоположение'),
+                ),
+            ],
+        ),
+    ]
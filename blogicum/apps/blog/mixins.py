@@ -1,14 +1,38 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.db.models import Model
+from django.db.models.query import QuerySet
+from django.http import Http404
 from django.http.response import HttpResponseRedirect
 from django.shortcuts import redirect
 from django.urls import reverse
 
+from blog import cache
+from blog.constants import CURSOR_PAGINATION, OFFSET_PAGINATION, POSTS_ON_PAGE
+from blog.paginators import CursorPaginator, InvalidCursor
+from core.cache import get_versions, version_time
+from core.http import ConditionalGetMixin, Validators, make_etag
+
 
 class OnlyAuthorMixin(UserPassesTestMixin):
     """Mixin which restricts non-author users from accessing edit page."""
 
     def test_func(self) -> bool:
-        return self.get_object().author == self.request.user
+        self.object = self.get_object()
+        # Comments of deleted users have no author, like anonymous users.
+        return (
+            self.request.user.is_authenticated
+            and self.object.author_id == self.request.user.pk
+        )
+
+    def get_object(self, queryset: Optional[QuerySet] = None) -> Model:
+        # Object fetched for the check is reused by the view.
+        if queryset is None and getattr(self, 'object', None) is not None:
+            return self.object
+        return super().get_object(queryset)  # type: ignore
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
@@ -28,3 +52,73 @@ class RedirectToProfileMixin:
             'blog:profile',
             kwargs={'username': self.object.author.username},  # type: ignore
         )
+
+
+class PostPaginationMixin:
+    """Mixin which paginates post list either by offset or by cursor.
+
+    Mode for each view is taken from POSTS_PAGINATION_MODES setting
+    by view name, offset pagination is used by default.
+    """
+
+    paginate_by = POSTS_ON_PAGE
+    cursor_kwarg = 'cursor'
+    cursor_field = 'pub_date'
+    cursor_descending = True
+
+    def get_pagination_mode(self) -> str:
+        resolver_match = self.request.resolver_match  # type: ignore
+        view_name = resolver_match.view_name if resolver_match else None
+        return getattr(settings, 'POSTS_PAGINATION_MODES', {}).get(
+            view_name, OFFSET_PAGINATION
+        )
+
+    def paginate_queryset(
+        self, queryset: QuerySet, page_size: int
+    ) -> Optional[tuple[Any, Any, Any, bool]]:
+        if self.get_pagination_mode() != CURSOR_PAGINATION:
+            return super().paginate_queryset(  # type: ignore
+                queryset, page_size
+            )
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            date_field=self.cursor_field,
+            descending=self.cursor_descending,
+        )
+        try:
+            page = paginator.page(
+                self.request.GET.get(self.cursor_kwarg)  # type: ignore
+            )
+        except InvalidCursor as error:
+            raise Http404(str(error)) from error
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PostConditionalGetMixin(ConditionalGetMixin):
+    """Conditional GET for pages which show posts.
+
+    Validators combine dates of the shown posts, which catch scheduled
+    posts going live, with version stamps of the page dependencies and
+    of the current user, so they are computed without rendering.
+    """
+
+    def get_validator_sources(
+        self,
+    ) -> Optional[tuple[list[Optional[datetime]], list[str]]]:
+        """Return dates and dependencies of the page, None if unknown."""
+        return None
+
+    def get_validators(self) -> Validators:
+        sources = self.get_validator_sources()
+        if sources is None:
+            return None, None
+        dates, dependencies = sources
+        user = self.request.user  # type: ignore
+        if user.is_authenticated:
+            dependencies = [*dependencies, cache.user(user.pk)]
+        versions = get_versions(dependencies)
+        timestamps = [date.timestamp() for date in dates if date is not None]
+        timestamps.extend(map(version_time, versions.values()))
+        etag = make_etag(user.pk, dates, sorted(versions.items()))
+        return etag, max(timestamps)
@@ -1,8 +1,33 @@
+from typing import Any, Optional
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.base_user import AbstractBaseUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    TextField,
+    Value,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-
+from django.utils.text import Truncator
+
+from blog.constants import EXCERPT_WORDS, SEARCH_SNIPPET_WORDS
+from blog.search import (
+    POST_SEARCH_TABLE,
+    RANK,
+    SNIPPET,
+    SNIPPET_END,
+    SNIPPET_START,
+    DocumentField,
+    to_match_query,
+)
 from core.models import (
     ContainsCreateDate,
     Publishable,
@@ -11,15 +36,38 @@ from core.models import (
 User = get_user_model()
 
 
+def make_excerpt(text: str) -> str:
+    """Return beginning of the text shown in post lists."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
 class PostQuerySet(models.QuerySet):
     """Custom query set for post model."""
 
     def get_all_for_user(self, user: AbstractBaseUser) -> 'PostQuerySet':
-        """Return all posts available for user."""
-        published_posts = self.get_published()
-        if user.is_authenticated:
-            published_posts |= self.filter(author=user)
-        return published_posts
+        """Return all posts available for user.
+
+        Anonymous users get plain published posts without any OR.
+        For authenticated ones visibility is a single predicate whose
+        branches are served by their own indexes (MULTI-INDEX OR).
+        Prefer get_by_author when the author is known.
+        """
+        if not user.is_authenticated:
+            return self.get_published()
+        return self.filter(Q(author=user) | self._published_condition())
+
+    def get_by_author(
+        self, author: AbstractBaseUser, user: AbstractBaseUser
+    ) -> 'PostQuerySet':
+        """Return posts of the author which are available for user.
+
+        Author sees all of their posts and everyone else sees only
+        published ones, so there is no OR to serve in either case.
+        """
+        posts = self.filter(author=author)
+        if author.pk != user.pk:
+            posts = posts.get_published()
+        return posts
 
     def get_published(self) -> 'PostQuerySet':
         """Fetch posts which are published.
@@ -29,7 +77,11 @@ class PostQuerySet(models.QuerySet):
         2. Belong to category with is_published flag set to False.
         3. Have pub_date greater than now.
         """
-        return self.filter(
+        return self.filter(self._published_condition())
+
+    @staticmethod
+    def _published_condition() -> Q:
+        return Q(
             is_published=True,
             category__is_published=True,
             pub_date__lte=timezone.now(),
@@ -37,9 +89,89 @@ class PostQuerySet(models.QuerySet):
 
     def select_all_related(self) -> 'PostQuerySet':
         """Select all foreign keys for the posts."""
-        return self.select_related(
-            'author', 'category', 'location'
-        ).prefetch_related('comments')
+        return self.select_related('author', 'category', 'location')
+
+    def search(self, query: str) -> 'PostQuerySet':
+        """Return posts matching every word of the query as a prefix.
+
+        Posts are annotated with search_rank, which is lower for better
+        matches, and search_snippet, the best matching fragment with
+        matches between SNIPPET_START and SNIPPET_END. The order is up
+        to the caller.
+        """
+        match = to_match_query(query)
+        if not match:
+            return self.none().annotate(
+                search_rank=Value(0.0, output_field=FloatField()),
+                search_snippet=Value('', output_field=TextField()),
+            )
+        # The index is joined once under its own name, which RANK and
+        # SNIPPET refer to.
+        return self.filter(search_index__document__match=match).annotate(
+            search_rank=RawSQL(RANK, (), output_field=FloatField()),
+            search_snippet=RawSQL(
+                SNIPPET,
+                (SNIPPET_START, SNIPPET_END, SEARCH_SNIPPET_WORDS),
+                output_field=TextField(),
+            ),
+        )
+
+    def change_comment_count(self, delta: int) -> int:
+        """Atomically add delta to the comment counter of the posts."""
+        return self.update(comment_count=F('comment_count') + delta)
+
+    def recount_comments(self) -> int:
+        """Recalculate comment counters of the posts from scratch."""
+        published_comments = (
+            Comment.objects.filter(post=OuterRef('pk'), is_published=True)
+            .order_by()
+            .values('post')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        return self.update(
+            comment_count=Coalesce(Subquery(published_comments), 0)
+        )
+
+    def update_excerpts(self, batch_size: int = 1000) -> int:
+        """Recompute stored excerpts of the posts which differ from text.
+
+        Return the number of updated posts.
+        """
+        batch = []
+        updated = 0
+        for post in self.only('pk', 'text', 'excerpt').iterator(batch_size):
+            excerpt = make_excerpt(post.text)
+            if excerpt == post.excerpt:
+                continue
+            post.excerpt = excerpt
+            batch.append(post)
+            if len(batch) == batch_size:
+                self.bulk_update(batch, ['excerpt'])
+                updated += len(batch)
+                batch = []
+        self.bulk_update(batch, ['excerpt'])
+        return updated + len(batch)
+
+
+class CommentQuerySet(models.QuerySet):
+    """Custom query set for comment model."""
+
+    def delete(self) -> tuple[int, dict[str, int]]:
+        """Delete comments and decrement comment counters of their posts."""
+        with transaction.atomic():
+            counts = list(
+                self.filter(is_published=True)
+                .order_by()
+                .values('post')
+                .annotate(count=Count('pk'))
+            )
+            result = super().delete()
+            for row in counts:
+                Post.objects.filter(pk=row['post']).change_comment_count(
+                    -row['count']
+                )
+        return result
 
 
 class Category(Publishable, ContainsCreateDate):
@@ -93,6 +225,12 @@ class Post(Publishable, ContainsCreateDate):
     text = models.TextField(
         verbose_name='Текст',
     )
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста',
+        help_text='Заполняется автоматически при сохранении.',
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=(
@@ -101,9 +239,12 @@ class Post(Publishable, ContainsCreateDate):
         ),
     )
 
+    # Foreign keys are the leading columns of the (key, -pub_date)
+    # indexes in Meta, which serve lookups by the key alone too.
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name='posts',
         verbose_name='Автор публикации',
     )
@@ -112,6 +253,7 @@ class Post(Publishable, ContainsCreateDate):
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
+        db_index=False,
         related_name='posts',
         verbose_name='Местоположение',
     )
@@ -119,6 +261,7 @@ class Post(Publishable, ContainsCreateDate):
         Category,
         on_delete=models.SET_NULL,
         null=True,
+        db_index=False,
         related_name='posts',
         verbose_name='Категория',
     )
@@ -129,10 +272,12 @@ class Post(Publishable, ContainsCreateDate):
         upload_to='post_images',
     )
 
-    @property
-    def comment_count(self) -> int:
-        """Count of comments under this post."""
-        return self.comments.count()
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+        help_text='Число опубликованных комментариев под публикацией.',
+    )
 
     objects = PostQuerySet.as_manager()
 
@@ -140,10 +285,67 @@ class Post(Publishable, ContainsCreateDate):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_date_idx',
+            ),
+            # Serves category feeds, where unpublished posts are filtered
+            # out of the index range, and admin, where they are shown.
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_date_idx',
+            ),
+            models.Index(
+                fields=('location', '-pub_date'),
+                name='post_location_date_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return f'{self.pub_date} - {self.title}'
 
+    @classmethod
+    def from_db(
+        cls, db: str, field_names: list[str], values: list[Any]
+    ) -> 'Post':
+        """Remember which category the post was loaded in."""
+        instance = super().from_db(db, field_names, values)
+        if 'category_id' not in instance.get_deferred_fields():
+            instance._loaded_category_id = instance.category_id
+        return instance
+
+    def save(self, *args, **kwargs) -> None:
+        """Save post with fresh excerpt and without its comment counter.
+
+        Comment counter is maintained with atomic updates, so the value
+        stored on a loaded instance may already be stale.
+        """
+        deferred_fields = self.get_deferred_fields()
+        if 'text' not in deferred_fields:
+            self.excerpt = make_excerpt(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        elif (
+            update_fields is None
+            and not self._state.adding
+            and self.pk is not None
+        ):
+            kwargs['update_fields'] = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name != 'comment_count'
+                and field.attname not in deferred_fields
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(Publishable, ContainsCreateDate):
     """A single comment under some post."""
@@ -163,10 +365,89 @@ class Comment(Publishable, ContainsCreateDate):
         verbose_name='Публикация',
     )
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return f'Комментарий {self.author} к посту "{self.post.title}"'
+
+    @classmethod
+    def from_db(
+        cls, db: str, field_names: list[str], values: list[Any]
+    ) -> 'Comment':
+        """Remember which post this comment is counted for."""
+        instance = super().from_db(db, field_names, values)
+        if not {'post_id', 'is_published'} & instance.get_deferred_fields():
+            instance._counted_post_id = (
+                instance.post_id if instance.is_published else None
+            )
+        return instance
+
+    def _get_counted_post_id(self) -> Optional[int]:
+        """Return id of the post whose counter includes this comment."""
+        if self._state.adding or self.pk is None:
+            return None
+        if hasattr(self, '_counted_post_id'):
+            return self._counted_post_id
+        return (
+            Comment.objects.filter(pk=self.pk, is_published=True)
+            .values_list('post_id', flat=True)
+            .first()
+        )
+
+    def save(self, *args, **kwargs) -> None:
+        """Save comment and keep comment counter of its post up to date."""
+        with transaction.atomic():
+            counted_post_id = self._get_counted_post_id()
+            new_counted_post_id = self.post_id if self.is_published else None
+            super().save(*args, **kwargs)
+            if counted_post_id != new_counted_post_id:
+                if counted_post_id is not None:
+                    Post.objects.filter(
+                        pk=counted_post_id
+                    ).change_comment_count(-1)
+                if new_counted_post_id is not None:
+                    Post.objects.filter(
+                        pk=new_counted_post_id
+                    ).change_comment_count(1)
+        self._counted_post_id = new_counted_post_id
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Delete comment and decrement comment counter of its post."""
+        with transaction.atomic():
+            counted_post_id = self._get_counted_post_id()
+            result = super().delete(*args, **kwargs)
+            if counted_post_id is not None:
+                Post.objects.filter(
+                    pk=counted_post_id
+                ).change_comment_count(-1)
+        self._counted_post_id = None
+        return result
+
+
+class PostSearchIndex(models.Model):
+    """Row of the full-text index of a post, see blog.search."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_index',
+    )
+    document = DocumentField(db_column=POST_SEARCH_TABLE)
+
+    class Meta:
+        managed = False
+        db_table = POST_SEARCH_TABLE
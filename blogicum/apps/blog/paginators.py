@@ -0,0 +1,172 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Optional, Union
+
+from django.core.paginator import InvalidPage
+from django.db.models import Model, Q
+from django.db.models.query import QuerySet
+
+FORWARD = 'n'
+BACKWARD = 'p'
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+# Value of the ordering field at the seek position, a date or a score.
+SeekValue = Union[datetime, float]
+
+
+def encode_cursor(direction: str, value: SeekValue, pk: int) -> str:
+    """Pack seek position into an opaque url-safe token."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([direction, value, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> tuple[str, SeekValue, int]:
+    """Unpack token created by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, value, pk = json.loads(raw)
+        if direction not in (FORWARD, BACKWARD):
+            raise ValueError(direction)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        else:
+            value = float(value)
+        return direction, value, int(pk)
+    except (binascii.Error, TypeError, ValueError) as error:
+        raise InvalidCursor('Invalid cursor') from error
+
+
+class CursorPage(Sequence):
+    """Page which knows only its neighbours, not its number."""
+
+    def __init__(
+        self,
+        object_list: list[Model],
+        paginator: 'CursorPaginator',
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self) -> str:
+        return f'<Cursor page of {len(self.object_list)} items>'
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Model, list[Model]]:
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        if not self._has_next:
+            return None
+        last = self.object_list[-1]
+        return encode_cursor(
+            FORWARD, getattr(last, self.paginator.date_field), last.pk
+        )
+
+    @property
+    def previous_cursor(self) -> Optional[str]:
+        if not self._has_previous:
+            return None
+        first = self.object_list[0]
+        return encode_cursor(
+            BACKWARD, getattr(first, self.paginator.date_field), first.pk
+        )
+
+
+class CursorPaginator:
+    """Keyset paginator which seeks on (date field, id).
+
+    Unlike django Paginator it never runs COUNT(*) or OFFSET queries,
+    so deep pages cost the same as the first one. By default it walks
+    posts from newest to oldest as Post.Meta.ordering does. The date
+    field may also be a numeric annotation, such as a search rank.
+    """
+
+    is_cursor = True
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        date_field: str = 'pub_date',
+        descending: bool = True,
+    ) -> None:
+        self.queryset = queryset
+        self.per_page = per_page
+        self.date_field = date_field
+        self.descending = descending
+
+    def _ordering(self, forward: bool) -> tuple[str, str]:
+        sign = '-' if self.descending == forward else ''
+        return f'{sign}{self.date_field}', f'{sign}pk'
+
+    def _fetch(
+        self, forward: bool, position: Optional[tuple[SeekValue, int]]
+    ) -> list[Model]:
+        """Fetch one extra object after position in the given direction."""
+        objects = self.queryset
+        if position is not None:
+            value, pk = position
+            lookup = 'lt' if self.descending == forward else 'gt'
+            objects = objects.filter(
+                Q(**{f'{self.date_field}__{lookup}': value})
+                | Q(**{self.date_field: value, f'pk__{lookup}': pk})
+            )
+        return list(
+            objects.order_by(*self._ordering(forward))[: self.per_page + 1]
+        )
+
+    def page(self, token: Optional[str]) -> CursorPage:
+        """Return page which follows or precedes the cursor position."""
+        if not token:
+            objects = self._fetch(forward=True, position=None)
+            return CursorPage(
+                objects[: self.per_page],
+                self,
+                has_next=len(objects) > self.per_page,
+                has_previous=False,
+            )
+
+        direction, value, pk = decode_cursor(token)
+        if direction == FORWARD:
+            objects = self._fetch(forward=True, position=(value, pk))
+            return CursorPage(
+                objects[: self.per_page],
+                self,
+                has_next=len(objects) > self.per_page,
+                has_previous=True,
+            )
+
+        objects = self._fetch(forward=False, position=(value, pk))
+        return CursorPage(
+            objects[: self.per_page][::-1],
+            self,
+            has_next=True,
+            has_previous=len(objects) > self.per_page,
+        )
@@ -0,0 +1,71 @@
+"""Full-text search over posts in the SQLite FTS5 index.
+
+The index is an external content table over blog_post, so it keeps
+only the tokens. Triggers created by migration 0015 update it on every
+insert, update and delete of posts, bulk ones included. The unmanaged
+PostSearchIndex model lets queries of posts join it.
+"""
+
+import re
+
+from django.db import models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Lookup
+from django.db.models.sql.compiler import SQLCompiler
+
+POST_SEARCH_TABLE = 'blog_post_fts'
+
+# Matches in titles weigh more than matches in texts.
+RANK = f'bm25({POST_SEARCH_TABLE}, 10.0, 1.0)'
+
+# Snippets mark matches with control characters, which are replaced
+# with tags after the snippet is escaped.
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET = f"snippet({POST_SEARCH_TABLE}, -1, %s, %s, ' …', %s)"
+
+# Names of triggers which keep the index up to date.
+POST_SEARCH_TRIGGERS = (
+    f'{POST_SEARCH_TABLE}_insert',
+    f'{POST_SEARCH_TABLE}_update',
+    f'{POST_SEARCH_TABLE}_delete',
+)
+
+# Words of the query beyond the limit are ignored.
+MAX_QUERY_WORDS = 10
+
+WORD = re.compile(r'\w+')
+
+
+class Match(Lookup):
+    """FTS5 full-text query of the table the document column belongs to."""
+
+    lookup_name = 'match'
+
+    def as_sql(
+        self, compiler: SQLCompiler, connection: BaseDatabaseWrapper
+    ) -> tuple[str, list]:
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class DocumentField(models.TextField):
+    """Hidden column of an FTS5 table, named after the table itself.
+
+    Filtering it with the match lookup joins the table, and auxiliary
+    functions such as bm25() work on the rows of that match.
+    """
+
+
+DocumentField.register_lookup(Match)
+
+
+def to_match_query(query: str) -> str:
+    """Turn user input into an FTS5 query matching all of its words.
+
+    Every word is quoted, so FTS5 operators in the input are plain text,
+    and matches as a prefix. Empty string is returned for no words.
+    """
+    words = WORD.findall(query)[:MAX_QUERY_WORDS]
+    return ' '.join(f'"{word}"*' for word in words)
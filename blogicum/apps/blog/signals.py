@@ -0,0 +1,164 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from blog import cache
+from blog.models import Category, Comment, Location, Post
+from core.bulk import BATCH_SIZE, bulk_updated
+from core.cache import bump_versions
+from core.fixtures import objects_loaded
+from core.utils import batched
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_category(sender: type, instance: Post, **kwargs) -> None:
+    """Remember category the post is moved from."""
+    if instance.pk is None:
+        instance._previous_category_id = None
+    elif hasattr(instance, '_loaded_category_id'):
+        instance._previous_category_id = instance._loaded_category_id
+    else:
+        instance._previous_category_id = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list('category_id', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender: type, instance: Post, **kwargs) -> None:
+    instance._loaded_category_id = instance.category_id
+    category_ids = {
+        instance.category_id,
+        getattr(instance, '_previous_category_id', None),
+    }
+    bump_versions(
+        cache.POSTS,
+        cache.CONTENT,
+        cache.post(instance.pk),
+        *(
+            cache.category_posts(category_id)
+            for category_id in category_ids
+            if category_id is not None
+        ),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender: type, instance: Comment, **kwargs) -> None:
+    bump_versions(cache.CONTENT, cache.post(instance.post_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender: type, instance: Category, **kwargs) -> None:
+    bump_versions(
+        cache.POSTS,
+        cache.CONTENT,
+        cache.CATEGORIES,
+        cache.category(instance.pk),
+        cache.category_posts(instance.pk),
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location(sender: type, instance: Location, **kwargs) -> None:
+    bump_versions(cache.CONTENT, cache.LOCATIONS, cache.location(instance.pk))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user(
+    sender: type, instance: AbstractBaseUser, **kwargs
+) -> None:
+    if kwargs.get('update_fields') == frozenset({'last_login'}):
+        return
+    bump_versions(cache.CONTENT, cache.USERNAMES, cache.user(instance.pk))
+
+
+def _distinct_values(model: type, field: str, pks: list[int]) -> set:
+    values = set()
+    for batch in batched(pks, BATCH_SIZE):
+        values.update(
+            model.objects.filter(pk__in=batch)
+            .order_by()
+            .values_list(field, flat=True)
+            .distinct()
+        )
+    values.discard(None)
+    return values
+
+
+@receiver(bulk_updated, sender=Post)
+def invalidate_posts(
+    sender: type, pks: list[int], previous: dict[str, set], **kwargs
+) -> None:
+    category_ids = _distinct_values(Post, 'category_id', pks)
+    category_ids.update(previous.get('category', ()))
+    category_ids.discard(None)
+    bump_versions(
+        cache.POSTS,
+        cache.CONTENT,
+        *(cache.category_posts(category_id) for category_id in category_ids),
+    )
+    for batch in batched(pks, BATCH_SIZE):
+        bump_versions(*(cache.post(pk) for pk in batch))
+
+
+@receiver(bulk_updated, sender=Comment)
+def recount_comments(sender: type, pks: list[int], **kwargs) -> None:
+    post_ids = sorted(_distinct_values(Comment, 'post_id', pks))
+    bump_versions(cache.CONTENT)
+    for batch in batched(post_ids, BATCH_SIZE):
+        Post.objects.filter(pk__in=batch).recount_comments()
+        bump_versions(*(cache.post(pk) for pk in batch))
+
+
+@receiver(bulk_updated, sender=Category)
+def invalidate_categories(sender: type, pks: list[int], **kwargs) -> None:
+    bump_versions(cache.POSTS, cache.CONTENT, cache.CATEGORIES)
+    for batch in batched(pks, BATCH_SIZE):
+        bump_versions(
+            *(cache.category(pk) for pk in batch),
+            *(cache.category_posts(pk) for pk in batch),
+        )
+
+
+@receiver(bulk_updated, sender=Location)
+def invalidate_locations(sender: type, pks: list[int], **kwargs) -> None:
+    bump_versions(cache.CONTENT, cache.LOCATIONS)
+    for batch in batched(pks, BATCH_SIZE):
+        bump_versions(*(cache.location(pk) for pk in batch))
+
+
+@receiver(objects_loaded, sender=Post)
+def fill_loaded_posts(
+    sender: type, pks: list[int], using: str, **kwargs
+) -> None:
+    """Compute excerpts and comment counters, which loading keeps as is."""
+    for batch in batched(pks, BATCH_SIZE):
+        posts = Post.objects.using(using).filter(pk__in=batch)
+        posts.update_excerpts()
+        posts.recount_comments()
+
+
+@receiver(objects_loaded, sender=Comment)
+def recount_loaded_comments(
+    sender: type, pks: list[int], using: str, **kwargs
+) -> None:
+    post_ids = set()
+    for batch in batched(pks, BATCH_SIZE):
+        post_ids.update(
+            Comment.objects.using(using)
+            .filter(pk__in=batch)
+            .order_by()
+            .values_list('post_id', flat=True)
+            .distinct()
+        )
+    for batch in batched(sorted(post_ids), BATCH_SIZE):
+        Post.objects.using(using).filter(pk__in=batch).recount_comments()
@@ -0,0 +1,58 @@
+from typing import Optional
+
+from django import template
+from django.http import HttpRequest
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+from blog import cache
+from blog.models import Post
+from blog.search import SNIPPET_END, SNIPPET_START
+from core.cache import get_versions
+from core.routers import state as replica_state
+
+register = template.Library()
+
+
+@register.filter
+def card_version(post: Post) -> str:
+    """Return stamp which changes whenever the card of the post does.
+
+    Card shows the post with its comment count, category, location
+    and author username, and each of them has its own version.
+    """
+    versions = get_versions(cache.post_dependencies([post]))
+    return ':'.join(versions[name] for name in sorted(versions))
+
+
+@register.simple_tag
+def cache_cards() -> bool:
+    """Return whether post cards may be cached.
+
+    Cards read from a replica may be older than their versions.
+    """
+    return replica_state.replica is None
+
+
+@register.filter
+def highlight(snippet: str) -> SafeString:
+    """Escape search snippet and wrap its matches in mark tags."""
+    return mark_safe(
+        escape(snippet)
+        .replace(SNIPPET_START, '<mark>')
+        .replace(SNIPPET_END, '</mark>')
+    )
+
+
+@register.simple_tag(takes_context=True)
+def cursor_url(context: dict, cursor: Optional[str]) -> str:
+    """Return query string of the current page moved to the cursor.
+
+    Other parameters, such as the search query, are kept.
+    """
+    request: HttpRequest = context['request']
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    if cursor:
+        params['cursor'] = cursor
+    return f'?{params.urlencode()}'
@@ -41,6 +41,11 @@ posts_patterns = [
 ]
 
 comment_patterns = [
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments',
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.add_comment,
@@ -65,6 +70,7 @@ urlpatterns = [
         views.CategoryPosts.as_view(),
         name='category_posts',
     ),
+    path('search/', views.SearchPosts.as_view(), name='search'),
     *profile_patterns,
     *posts_patterns,
     *comment_patterns,
@@ -1,11 +1,15 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Max
 from django.db.models.query import QuerySet
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_GET
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -14,32 +18,108 @@ from django.views.generic import (
     UpdateView,
 )
 
-from blog.constants import POSTS_ON_PAGE
+from blog import cache
+from blog.constants import CURSOR_PAGINATION
 from blog.forms import CommentForm, PostForm, ProfileForm
 from blog.mixins import (
     OnlyAuthorMixin,
+    PostConditionalGetMixin,
+    PostPaginationMixin,
     RedirectToPostPageMixin,
     RedirectToProfileMixin,
 )
 from blog.models import Category, Comment, Post
+from blog.paginators import CursorPage, CursorPaginator, InvalidCursor
+from core.cache import AnonymousPageCacheMixin
+from core.routers import ReplicaReadsMixin
 
 User = get_user_model()
 
 
-class Index(ListView):
+def paginate_comments(post: Post, cursor: Optional[str] = None) -> CursorPage:
+    """Return block of published comments under the post, oldest first.
+
+    Only published comments are listed, the same ones comment_count counts.
+    """
+    paginator = CursorPaginator(
+        post.comments.filter(is_published=True).select_related('author'),
+        settings.COMMENTS_PAGE_SIZE,
+        date_field='created_at',
+        descending=False,
+    )
+    return paginator.page(cursor)
+
+
+class Index(
+    ReplicaReadsMixin,
+    AnonymousPageCacheMixin,
+    PostConditionalGetMixin,
+    PostPaginationMixin,
+    ListView,
+):
     model = Post
     template_name = 'blog/index.html'
-    paginate_by = POSTS_ON_PAGE
+
+    def get_validator_sources(
+        self,
+    ) -> Optional[tuple[list[Optional[datetime]], list[str]]]:
+        last_pub_date = Post.objects.get_published().aggregate(
+            last=Max('pub_date')
+        )['last']
+        return [last_pub_date], [cache.CONTENT]
 
     def get_queryset(self) -> QuerySet[Any]:
-        return super().get_queryset().select_all_related().get_published()
+        return (
+            super()
+            .get_queryset()
+            .select_all_related()
+            .get_published()
+            .defer('text')
+        )
 
+    def get_page_dependencies(self, response: HttpResponse) -> list[str]:
+        return [
+            cache.POSTS,
+            *cache.post_dependencies(response.context_data['page_obj']),
+        ]
 
-class PostDetail(DetailView):
+
+class PostDetail(
+    ReplicaReadsMixin,
+    AnonymousPageCacheMixin,
+    PostConditionalGetMixin,
+    DetailView,
+):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_validator_sources(
+        self,
+    ) -> Optional[tuple[list[Optional[datetime]], list[str]]]:
+        post = (
+            Post.objects.get_all_for_user(self.request.user)
+            .filter(pk=self.kwargs['post_id'])
+            .annotate(last_comment=Max('comments__created_at'))
+            .values(
+                'pub_date',
+                'last_comment',
+                'category_id',
+                'location_id',
+                'author_id',
+            )
+            .first()
+        )
+        if post is None:
+            return None
+        return [post['pub_date'], post['last_comment']], [
+            cache.post(self.kwargs['post_id']),
+            cache.category(post['category_id']),
+            cache.location(post['location_id']),
+            cache.user(post['author_id']),
+            cache.USERNAMES,
+        ]
+
     def get_queryset(self) -> QuerySet[Any]:
         return (
             super()
@@ -51,9 +131,35 @@ class PostDetail(DetailView):
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = paginate_comments(self.object)
         return context
 
+    def get_page_dependencies(self, response: HttpResponse) -> list[str]:
+        return [
+            *cache.post_dependencies([self.object]),
+            *{
+                cache.user(comment.author_id)
+                for comment in response.context_data['comments']
+            },
+        ]
+
+
+@require_GET
+def post_comments(request: HttpRequest, post_id: int) -> HttpResponse:
+    """Render the next block of comments under the post."""
+    post = get_object_or_404(
+        Post.objects.get_all_for_user(request.user), pk=post_id
+    )
+    try:
+        comments = paginate_comments(post, request.GET.get('cursor'))
+    except InvalidCursor as error:
+        raise Http404(str(error)) from error
+    return render(
+        request,
+        'includes/comment_list.html',
+        {'post': post, 'comments': comments},
+    )
+
 
 class CreatePost(LoginRequiredMixin, RedirectToProfileMixin, CreateView):
     model = Post
@@ -77,32 +183,44 @@ class DeletePost(OnlyAuthorMixin, RedirectToProfileMixin, DeleteView):
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
-    def get_context_data(self, **kwargs) -> dict[str, Any]:
-        context = super().get_context_data(**kwargs)
-        context['form'] = PostForm(instance=self.object)
-        return context
+    def get_queryset(self) -> QuerySet[Any]:
+        # The post is shown read-only, with its location.
+        return super().get_queryset().select_related('location')
 
 
-class ViewProfile(ListView):
+class ViewProfile(
+    ReplicaReadsMixin, PostConditionalGetMixin, PostPaginationMixin, ListView
+):
     model = Post
     template_name = 'blog/profile.html'
-    paginate_by = POSTS_ON_PAGE
+
+    def get_validator_sources(
+        self,
+    ) -> Optional[tuple[list[Optional[datetime]], list[str]]]:
+        username = self.kwargs['username']
+        posts = Post.objects.filter(author__username=username)
+        if self.request.user.get_username() != username:
+            posts = posts.get_published()
+        last_pub_date = posts.aggregate(last=Max('pub_date'))['last']
+        if last_pub_date is None:
+            return None
+        return [last_pub_date], [cache.CONTENT]
 
     def get_queryset(self) -> QuerySet[Any]:
+        self.profile = get_object_or_404(
+            User, username=self.kwargs['username']
+        )
         return (
             super()
             .get_queryset()
             .select_all_related()
-            .get_all_for_user(self.request.user)
-            .filter(author__username=self.kwargs['username'])
+            .get_by_author(self.profile, self.request.user)
+            .defer('text')
         )
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        profile_owner = get_object_or_404(
-            User, username=self.kwargs['username']
-        )
-        context['profile'] = profile_owner
+        context['profile'] = self.profile
         return context
 
 
@@ -121,10 +239,27 @@ def edit_profile(request: HttpRequest) -> HttpResponse:
     )
 
 
-class CategoryPosts(ListView):
+class CategoryPosts(
+    ReplicaReadsMixin,
+    AnonymousPageCacheMixin,
+    PostConditionalGetMixin,
+    PostPaginationMixin,
+    ListView,
+):
     model = Post
     template_name = 'blog/category.html'
-    paginate_by = POSTS_ON_PAGE
+
+    def get_validator_sources(
+        self,
+    ) -> Optional[tuple[list[Optional[datetime]], list[str]]]:
+        last_pub_date = (
+            Post.objects.get_published()
+            .filter(category__slug=self.kwargs['category_slug'])
+            .aggregate(last=Max('pub_date'))['last']
+        )
+        if last_pub_date is None:
+            return None
+        return [last_pub_date], [cache.CONTENT]
 
     def get_queryset(self) -> QuerySet[Any]:
         self.category = get_object_or_404(
@@ -137,6 +272,7 @@ class CategoryPosts(ListView):
             .select_all_related()
             .get_published()
             .filter(category__slug=self.kwargs['category_slug'])
+            .defer('text')
         )
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
@@ -144,6 +280,42 @@ class CategoryPosts(ListView):
         context['category'] = self.category
         return context
 
+    def get_page_dependencies(self, response: HttpResponse) -> list[str]:
+        return [
+            cache.category(self.category.pk),
+            cache.category_posts(self.category.pk),
+            *cache.post_dependencies(response.context_data['page_obj']),
+        ]
+
+
+class SearchPosts(ReplicaReadsMixin, PostPaginationMixin, ListView):
+    """Published posts matching the query, best matches first."""
+
+    model = Post
+    template_name = 'blog/search.html'
+    cursor_field = 'search_rank'
+    cursor_descending = False
+
+    def get_pagination_mode(self) -> str:
+        # Offsets would rank all matches before every page.
+        return CURSOR_PAGINATION
+
+    def get_queryset(self) -> QuerySet[Any]:
+        self.query = self.request.GET.get('q', '').strip()
+        return (
+            super()
+            .get_queryset()
+            .select_all_related()
+            .get_published()
+            .search(self.query)
+            .defer('text')
+        )
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        return context
+
 
 @login_required
 def add_comment(request: HttpRequest, post_id: int) -> HttpResponse:
@@ -166,11 +338,7 @@ class EditComment(OnlyAuthorMixin, RedirectToPostPageMixin, UpdateView):
     pk_url_kwarg = 'comment_id'
 
     def get_queryset(self) -> QuerySet[Any]:
-        return (
-            super()
-            .get_queryset()
-            .filter(post=get_object_or_404(Post, id=self.kwargs['post_id']))
-        )
+        return super().get_queryset().filter(post_id=self.kwargs['post_id'])
 
 
 class DeleteComment(OnlyAuthorMixin, RedirectToPostPageMixin, DeleteView):
@@ -179,8 +347,4 @@ class DeleteComment(OnlyAuthorMixin, RedirectToPostPageMixin, DeleteView):
     pk_url_kwarg = 'comment_id'
 
     def get_queryset(self) -> QuerySet[Any]:
-        return (
-            super()
-            .get_queryset()
-            .filter(post=get_object_or_404(Post, id=self.kwargs['post_id']))
-        )
+        return super().get_queryset().filter(post_id=self.kwargs['post_id'])
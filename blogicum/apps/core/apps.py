@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self) -> None:
+        from core.checks import check_production_settings
+        from core.slow_queries import install_slow_query_logger
+
+        connection_created.connect(install_slow_query_logger)
+
+        # System checks do not run when a WSGI server boots the project.
+        errors = check_production_settings(None)
+        if errors:
+            raise ImproperlyConfigured(
+                'Production profile refuses to start:\n'
+                + '\n'.join(f'  {error}' for error in errors)
+            )
@@ -0,0 +1,121 @@
+"""SQLite backend with connection pragmas and serialized writes.
+
+OPTIONS of the database accept two more keys:
+
+- 'pragmas': mapping of PRAGMA names to values run on every new
+  connection, e.g. {'journal_mode': 'wal', 'busy_timeout': 5000}.
+- 'serialize_writes': when true, threads of the process write one at a
+  time. A thread waits for the lock before its first write statement
+  and holds it until the transaction ends, so writers queue up in the
+  process instead of failing with "database is locked", while readers
+  are never blocked.
+"""
+
+import re
+import threading
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from django.db.backends.sqlite3 import base
+
+WRITE_RE = re.compile(
+    r'\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b', re.IGNORECASE
+)
+PRAGMA_NAME_RE = re.compile(r'^\w+$')
+
+_writer_locks: dict[str, threading.Lock] = {}
+_writer_locks_lock = threading.Lock()
+
+
+def get_writer_lock(name: str) -> threading.Lock:
+    """Return lock shared by all connections to the database file."""
+    with _writer_locks_lock:
+        return _writer_locks.setdefault(name, threading.Lock())
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    db: 'DatabaseWrapper'
+
+    def execute(
+        self, query: str, params: object = None
+    ) -> 'SQLiteCursorWrapper':
+        if WRITE_RE.match(query):
+            self.db.acquire_writer_lock()
+        try:
+            return super().execute(query, params)
+        finally:
+            self.db.release_writer_lock_after_statement()
+
+    def executemany(
+        self, query: str, param_list: Iterable
+    ) -> 'SQLiteCursorWrapper':
+        if WRITE_RE.match(query):
+            self.db.acquire_writer_lock()
+        try:
+            return super().executemany(query, param_list)
+        finally:
+            self.db.release_writer_lock_after_statement()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    holds_writer_lock = False
+
+    def get_connection_params(self) -> dict[str, Any]:
+        params = super().get_connection_params()
+        self.pragmas = params.pop('pragmas', {})
+        self.serialize_writes = params.pop('serialize_writes', False)
+        self.writer_lock_timeout = params.get('timeout', 5)
+        return params
+
+    def get_new_connection(
+        self, conn_params: dict[str, Any]
+    ) -> base.Database.Connection:
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            if not PRAGMA_NAME_RE.match(name):
+                raise ValueError(f'Invalid PRAGMA name {name!r}.')
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def create_cursor(self, name: Optional[str] = None) -> SQLiteCursorWrapper:
+        cursor = self.connection.cursor(factory=SQLiteCursorWrapper)
+        cursor.db = self
+        return cursor
+
+    def acquire_writer_lock(self) -> None:
+        if not self.serialize_writes or self.holds_writer_lock:
+            return
+        lock = get_writer_lock(str(self.settings_dict['NAME']))
+        if not lock.acquire(timeout=self.writer_lock_timeout):
+            raise base.Database.OperationalError(
+                'database is locked: timed out waiting for writer queue'
+            )
+        self.holds_writer_lock = True
+
+    def release_writer_lock(self) -> None:
+        if self.holds_writer_lock:
+            self.holds_writer_lock = False
+            get_writer_lock(str(self.settings_dict['NAME'])).release()
+
+    def release_writer_lock_after_statement(self) -> None:
+        # Outside of transactions every statement is committed at once.
+        if not self.in_atomic_block and self.get_autocommit():
+            self.release_writer_lock()
+
+    def _commit(self) -> None:
+        try:
+            super()._commit()
+        finally:
+            self.release_writer_lock()
+
+    def _rollback(self) -> None:
+        try:
+            super()._rollback()
+        finally:
+            self.release_writer_lock()
+
+    def _close(self) -> None:
+        try:
+            super()._close()
+        finally:
+            self.release_writer_lock()
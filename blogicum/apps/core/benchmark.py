@@ -0,0 +1,173 @@
+import math
+import statistics
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+from uuid import uuid4
+
+from django.db import connection
+from django.test import override_settings
+
+# Two-sided 95% critical values of Student's t by degrees of freedom.
+T_CRITICAL_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)  # fmt: skip
+Z_CRITICAL_95 = 1.96
+
+
+@contextmanager
+def scratch_database(
+    keepdb: bool = False, name: Optional[str] = None
+) -> Iterator[None]:
+    """Run the block against a throwaway migrated copy of the database.
+
+    The copy is created the same way as the test database, so benchmark
+    data never reaches the development database. The name replaces the
+    test database name, e.g. to use a file instead of SQLite memory.
+    The block also gets an empty cache of its own: cached pages of the
+    development database would be served instead of the scratch ones,
+    and cards of scratch posts would leak into the development site.
+    """
+    scratch_cache = override_settings(
+        CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': f'scratch-{uuid4().hex}',
+            }
+        }
+    )
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if name is not None:
+        test_settings['NAME'] = name
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb
+    )
+    try:
+        with scratch_cache:
+            yield
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
+        test_settings['NAME'] = old_test_name
+
+
+def time_calls(func: Callable[[], object], repeat: int) -> list[float]:
+    """Call func repeat times and return durations in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Return percentile of values with linear interpolation."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower
+    )
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    """Return basic statistics of timings in milliseconds."""
+    milliseconds = [timing * 1000 for timing in timings]
+    return {
+        'min': min(milliseconds),
+        'median': statistics.median(milliseconds),
+        'p95': percentile(milliseconds, 95),
+        'max': max(milliseconds),
+    }
+
+
+def confidence_interval(values: list[float]) -> tuple[float, float]:
+    """Return 95% confidence interval of the mean of values."""
+    mean = statistics.mean(values)
+    if len(values) < 2:
+        return mean, mean
+    degrees = len(values) - 1
+    critical = (
+        T_CRITICAL_95[degrees - 1]
+        if degrees <= len(T_CRITICAL_95)
+        else Z_CRITICAL_95
+    )
+    margin = critical * statistics.stdev(values) / math.sqrt(len(values))
+    return mean - margin, mean + margin
+
+
+@dataclass
+class Regression:
+    """Metric of a benchmark result that got worse than its baseline."""
+
+    key: str
+    metric: str
+    baseline: Union[int, float]
+    current: Union[int, float]
+    detail: str = ''
+
+    def __str__(self) -> str:
+        change = (
+            f'{(self.current - self.baseline) / self.baseline:+.1%}'
+            if self.baseline
+            else 'new'
+        )
+        return (
+            f'{self.key}: {self.metric} {self.baseline:g} -> '
+            f'{self.current:g} ({change}){self.detail}'
+        )
+
+
+def find_regressions(
+    baseline: list[dict],
+    current: list[dict],
+    threshold: float,
+    query_threshold: int = 0,
+) -> list[Regression]:
+    """Compare results matched by key and return the regressed metrics.
+
+    Latency regresses when the mean p95 grew by more than threshold and
+    the confidence intervals of both runs do not overlap, so noise alone
+    does not fail the comparison. Query counts are deterministic and
+    regress when they grew by more than query_threshold.
+    """
+    baseline_by_key = {result['key']: result for result in baseline}
+    regressions = []
+    for result in current:
+        previous = baseline_by_key.get(result['key'])
+        if previous is None:
+            continue
+        old_low, old_high = confidence_interval(previous['p95_samples'])
+        new_low, new_high = confidence_interval(result['p95_samples'])
+        old_mean = statistics.mean(previous['p95_samples'])
+        new_mean = statistics.mean(result['p95_samples'])
+        if new_mean > old_mean * (1 + threshold) and new_low > old_high:
+            regressions.append(
+                Regression(
+                    result['key'],
+                    'p95 ms',
+                    round(old_mean, 3),
+                    round(new_mean, 3),
+                    f', 95% CI {old_low:.2f}..{old_high:.2f}'
+                    f' -> {new_low:.2f}..{new_high:.2f}',
+                )
+            )
+        if result['queries'] > previous['queries'] + query_threshold:
+            regressions.append(
+                Regression(
+                    result['key'],
+                    'queries',
+                    previous['queries'],
+                    result['queries'],
+                )
+            )
+    return regressions
@@ -0,0 +1,54 @@
+"""Set-based updates of large selections.
+
+Rows are never loaded as model instances, so save() and its signals do
+not run. Receivers of bulk_updated refresh caches and counters for all
+updated rows at once instead.
+"""
+
+from django.db import transaction
+from django.db.models.query import QuerySet
+from django.dispatch import Signal
+
+from core.utils import batched
+
+BATCH_SIZE = 500
+
+# Sent once per bulk_update, after its transaction commits, with
+# sender=model and arguments pks (updated primary keys), values (the
+# update) and previous (set of old values of every updated field by
+# field name).
+bulk_updated = Signal()
+
+
+def bulk_update(queryset: QuerySet, **values) -> int:
+    """Update rows of the queryset which differ from values.
+
+    Keys and old values of the rows are read at once, then one
+    UPDATE ... WHERE id IN (...) runs per batch. Return the number of
+    updated rows.
+    """
+    model = queryset.model
+    attnames = [model._meta.get_field(name).attname for name in values]
+    rows = list(
+        queryset.exclude(**values).order_by().values_list('pk', *attnames)
+    )
+    if not rows:
+        return 0
+    pks = [row[0] for row in rows]
+    previous = {
+        name: {row[index] for row in rows}
+        for index, name in enumerate(values, 1)
+    }
+    manager = model._base_manager.using(queryset.db)
+    with transaction.atomic(using=queryset.db):
+        for batch in batched(pks, BATCH_SIZE):
+            manager.filter(pk__in=batch).update(**values)
+        # Receivers bump cache versions, so they run after the commit,
+        # when no request can read the rows as they were.
+        transaction.on_commit(
+            lambda: bulk_updated.send(
+                sender=model, pks=pks, values=values, previous=previous
+            ),
+            using=queryset.db,
+        )
+    return len(pks)
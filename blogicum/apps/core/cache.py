@@ -0,0 +1,179 @@
+import time
+from collections.abc import Iterable
+from typing import Callable, Optional, TypeVar
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe, urlencode
+
+from core.routers import state as replica_state
+
+T = TypeVar('T')
+
+VERSION_KEY_PREFIX = 'version'
+PAGE_KEY_PREFIX = 'page'
+# Changes on every bump of any version.
+LAST_BUMP_KEY = f'{VERSION_KEY_PREFIX}:*'
+# Dependency of everything cached with versions.
+EPOCH = '*epoch'
+
+
+def _version_key(dependency: str) -> str:
+    return f'{VERSION_KEY_PREFIX}:{dependency}'
+
+
+def _new_version() -> str:
+    return f'{time.time():.6f}:{uuid4().hex}'
+
+
+def version_time(version: str) -> float:
+    """Return unix time when the version stamp was issued."""
+    return max(float(stamp.partition(':')[0]) for stamp in version.split('|'))
+
+
+def get_versions(dependencies: Iterable[str]) -> dict[str, str]:
+    """Return current version stamps of the dependencies.
+
+    Stamps are unique, so a counter evicted from cache never comes
+    back with a value some stale entry was stored with. Every stamp
+    includes the version of EPOCH, so bump_all changes all of them.
+    """
+    keys = {
+        _version_key(dependency): dependency for dependency in dependencies
+    }
+    epoch_key = _version_key(EPOCH)
+    stored = cache.get_many([*keys, epoch_key])
+    for key in {*keys, epoch_key} - stored.keys():
+        cache.add(key, _new_version(), timeout=None)
+        stored[key] = cache.get(key)
+    epoch = stored[epoch_key]
+    return {keys[key]: f'{stored[key]}|{epoch}' for key in keys}
+
+
+def bump_versions(*dependencies: str) -> None:
+    """Invalidate everything cached with any of the dependencies."""
+    cache.set_many(
+        {
+            **{
+                _version_key(dependency): _new_version()
+                for dependency in dependencies
+            },
+            LAST_BUMP_KEY: _new_version(),
+        },
+        timeout=None,
+    )
+
+
+def bump_all() -> None:
+    """Invalidate everything cached with versions."""
+    bump_versions(EPOCH)
+
+
+def get_or_compute(
+    key: str,
+    dependencies: Iterable[str],
+    compute: Callable[[], T],
+    timeout: Optional[int] = None,
+) -> T:
+    """Return cached value, computed again once a dependency changes."""
+    versions = get_versions(dependencies)
+    entry = cache.get(key)
+    if entry is not None and entry[1] == versions:
+        return entry[0]
+    value = compute()
+    cache.set(key, (value, versions), timeout=timeout)
+    return value
+
+
+class AnonymousPageCacheMixin:
+    """Mixin which caches rendered pages for anonymous users.
+
+    Every cached page stores versions of the objects it was rendered
+    from (see get_page_dependencies) and is served only while all of
+    them stay the same, so changes invalidate only the affected pages.
+    Pages read from a replica are served but not cached.
+    """
+
+    page_cache_query_params = ('page', 'cursor')
+
+    def get_page_cache_timeout(self) -> int:
+        return settings.PAGE_CACHE_TIMEOUT
+
+    def get_page_cache_key(self) -> str:
+        request: HttpRequest = self.request  # type: ignore
+        # Values are encoded, so ones containing & or = can not make two
+        # query strings share a key.
+        params = urlencode(
+            sorted(
+                (name, request.GET.getlist(name))
+                for name in self.page_cache_query_params
+                if name in request.GET
+            ),
+            doseq=True,
+        )
+        return f'{PAGE_KEY_PREFIX}:{request.path}?{params}'
+
+    def get_page_dependencies(self, response: HttpResponse) -> list[str]:
+        """Return names of objects the page was rendered from."""
+        return []
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if (
+            request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+            or not self.get_page_cache_timeout()
+        ):
+            return super().dispatch(request, *args, **kwargs)  # type: ignore
+
+        key = self.get_page_cache_key()
+        cached_page = self._get_cached_page(key)
+        if cached_page is not None:
+            last_modified = cached_page.get('Last-Modified')
+            return get_conditional_response(
+                request,
+                etag=cached_page.get('ETag'),
+                last_modified=last_modified
+                and parse_http_date_safe(last_modified),
+                response=cached_page,
+            )
+
+        last_bump = cache.get(LAST_BUMP_KEY)
+        response = super().dispatch(request, *args, **kwargs)  # type: ignore
+        if getattr(response, 'is_rendered', True):
+            self._cache_page(key, response, last_bump)
+        else:
+            response.add_post_render_callback(
+                lambda rendered: self._cache_page(key, rendered, last_bump)
+            )
+        return response
+
+    def _get_cached_page(self, key: str) -> Optional[HttpResponse]:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        response, versions = entry
+        if get_versions(versions) != versions:
+            return None
+        return response
+
+    def _cache_page(
+        self, key: str, response: HttpResponse, last_bump: Optional[str]
+    ) -> None:
+        if (
+            response.status_code != 200
+            or response.cookies
+            # Replicas may be older than the versions.
+            or replica_state.replica
+        ):
+            return
+        versions = get_versions(self.get_page_dependencies(response))
+        if cache.get(LAST_BUMP_KEY) != last_bump:
+            # The page may show data older than the versions, which were
+            # bumped while it was rendered.
+            return
+        cache.set(
+            key, (response, versions), timeout=self.get_page_cache_timeout()
+        )
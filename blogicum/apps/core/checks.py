@@ -0,0 +1,73 @@
+from typing import Optional
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+DEBUG_APPS = ('debug_toolbar',)
+DEBUG_MIDDLEWARE = ('debug_toolbar.middleware.DebugToolbarMiddleware',)
+# Cache backends private to a process, which can not carry version bumps
+# to other workers.
+PROCESS_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+@register(Tags.security)
+def check_production_settings(
+    app_configs: Optional[list[AppConfig]], **kwargs
+) -> list[Error]:
+    """Find debug-only components enabled in the production profile."""
+    if settings.SETTINGS_PROFILE != 'production':
+        return []
+    errors = []
+    if settings.DEBUG:
+        errors.append(Error('DEBUG is on in production.', id='core.E001'))
+    errors.extend(
+        Error(f'Debug app {app} is installed in production.', id='core.E002')
+        for app in DEBUG_APPS
+        if app in settings.INSTALLED_APPS
+    )
+    errors.extend(
+        Error(
+            f'Debug middleware {middleware} is enabled in production.',
+            id='core.E003',
+        )
+        for middleware in DEBUG_MIDDLEWARE
+        if middleware in settings.MIDDLEWARE
+    )
+    errors.extend(
+        Error(
+            f'Template debugging is on for {template["BACKEND"]}.',
+            id='core.E004',
+        )
+        for template in settings.TEMPLATES
+        if template.get('OPTIONS', {}).get('debug')
+    )
+    errors.extend(
+        Error(
+            f'Cache {alias!r} is not shared between worker processes.',
+            hint='Use a file, database or memcached cache backend.',
+            id='core.E006',
+        )
+        for alias, config in settings.CACHES.items()
+        if config['BACKEND'] in PROCESS_CACHES
+    )
+    if settings.METRICS_TRUST_INTERNAL_IPS:
+        errors.append(
+            Error(
+                'Metrics are shown to any request from INTERNAL_IPS.',
+                hint=(
+                    'Behind a reverse proxy that is every request, turn'
+                    ' METRICS_TRUST_INTERNAL_IPS off and use METRICS_TOKENS.'
+                ),
+                id='core.E007',
+            )
+        )
+    if settings.QUERY_BUDGETS_STRICT:
+        errors.append(
+            Error(
+                'Exceeded query budgets would fail requests in production.',
+                hint='Turn QUERY_BUDGETS_STRICT off.',
+                id='core.E005',
+            )
+        )
+    return errors
@@ -0,0 +1,22 @@
+from django.db import connections
+from django.db.models.query import QuerySet
+
+
+def explain_query_plan(queryset: QuerySet) -> list[str]:
+    """Return SQLite EXPLAIN QUERY PLAN lines for the queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def copy_sqlite_database(source: str, target: str) -> None:
+    """Copy SQLite database to another one with the online backup API.
+
+    Readers of the source are not blocked while it is copied.
+    """
+    source_connection = connections[source]
+    target_connection = connections[target]
+    source_connection.ensure_connection()
+    target_connection.ensure_connection()
+    source_connection.connection.backup(target_connection.connection)
@@ -0,0 +1,271 @@
+"""Streaming load and dump of fixtures in the dumpdata JSON format.
+
+Objects are read and written one at a time, so the size of a fixture
+is not bound by memory.
+"""
+
+import gzip
+import json
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO
+
+from django.core import serializers
+from django.core.serializers.base import DeserializedObject
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Model
+from django.dispatch import Signal
+
+from core.utils import batched
+
+READ_SIZE = 1 << 16
+WHITESPACE = ' \t\n\r'
+
+# Sent by load_objects for every model it saved, inside its transaction,
+# with sender=model and arguments pks (saved primary keys) and using.
+# Objects are saved without save() and its signals, so receivers fill in
+# what save() would.
+objects_loaded = Signal()
+
+
+def open_fixture(path: Path, mode: str) -> IO[str]:
+    """Open fixture as text, compressed when its name ends with .gz."""
+    if path.suffix == '.gz':
+        return gzip.open(path, f'{mode}t', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class JSONArrayReader:
+    """Iterator over items of the JSON array in a text file.
+
+    Only the current item and a block of text after it are in memory.
+    """
+
+    def __init__(self, file: IO[str], read_size: int = READ_SIZE) -> None:
+        self.file = file
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        chunk = self.file.read(size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return not self.eof
+
+    def _next_char(self) -> str:
+        """Skip whitespace and return the next character, empty at end."""
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position] in WHITESPACE
+            ):
+                self.position += 1
+            if self.position < len(self.buffer) or not self._fill(
+                self.read_size
+            ):
+                return self.buffer[self.position : self.position + 1]
+
+    def _decode(self) -> object:
+        self._next_char()
+        while True:
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the file.
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return item
+            # Reading as much as the buffer holds keeps retries linear.
+            self._fill(max(self.read_size, len(self.buffer)))
+
+    def __iter__(self) -> Iterator[object]:
+        if self._next_char() != '[':
+            raise ValueError('Fixture is not a JSON array.')
+        self.position += 1
+        if self._next_char() == ']':
+            return
+        while True:
+            yield self._decode()
+            char = self._next_char()
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f'Expected "," or "]", got {char!r}.')
+            self.position += 1
+
+
+def sort_models(models: Iterable[type[Model]]) -> list[type[Model]]:
+    """Order models so the ones referenced by foreign keys come first.
+
+    Models in a reference cycle keep an arbitrary order among them.
+    """
+    models = set(models)
+    ordered: list[type[Model]] = []
+    visited: set[type[Model]] = set()
+
+    def visit(model: type[Model]) -> None:
+        if model in visited:
+            return
+        visited.add(model)
+        for field in model._meta.concrete_fields:
+            if field.is_relation and field.related_model in models:
+                visit(field.related_model)
+        ordered.append(model)
+
+    for model in sorted(models, key=lambda model: model._meta.label):
+        visit(model)
+    return ordered
+
+
+def save_m2m(
+    model: type[Model], items: list[DeserializedObject], using: str
+) -> None:
+    """Replace many-to-many links of the objects with the fixture ones."""
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        if not through._meta.auto_created:
+            # Rows of explicit through models are in the fixture.
+            continue
+        links = {
+            item.object.pk: item.m2m_data[field.name]
+            for item in items
+            if field.name in item.m2m_data
+        }
+        if not links:
+            continue
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(
+            field.m2m_reverse_field_name()
+        ).attname
+        manager = through._base_manager.using(using)
+        manager.filter(**{f'{source}__in': links}).delete()
+        manager.bulk_create(
+            through(**{source: pk, target: value})
+            for pk, values in links.items()
+            for value in values
+        )
+
+
+def insert_raw(model: type[Model], objects: list[Model], using: str) -> None:
+    """Insert objects in bulk with field values as they are.
+
+    Unlike bulk_create, values of auto_now and auto_now_add fields are
+    kept, as in raw saves of loaddata.
+    """
+    manager = model._base_manager.using(using)
+    ops = connections[using].ops
+    for has_pk in (True, False):
+        group = [obj for obj in objects if (obj.pk is not None) == has_pk]
+        if not group:
+            continue
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if has_pk or not field.primary_key
+        ]
+        size = max(ops.bulk_batch_size(fields, group), 1)
+        for batch in batched(group, size):
+            manager._insert(batch, fields=fields, using=using, raw=True)
+
+
+def save_batch(
+    model: type[Model], items: list[DeserializedObject], using: str
+) -> None:
+    """Insert new objects and update existing ones, like loaddata."""
+    manager = model._base_manager.using(using)
+    objects = [item.object for item in items]
+    existing = set(
+        manager.filter(
+            pk__in=[obj.pk for obj in objects if obj.pk is not None]
+        ).values_list('pk', flat=True)
+    )
+    insert_raw(
+        model, [obj for obj in objects if obj.pk not in existing], using
+    )
+    if existing:
+        manager.bulk_update(
+            [obj for obj in objects if obj.pk in existing],
+            [
+                field.name
+                for field in model._meta.concrete_fields
+                if not field.primary_key
+            ],
+        )
+    save_m2m(model, items, using)
+
+
+def load_objects(
+    objects: list[dict],
+    using: str,
+    batch_size: int,
+    ignorenonexistent: bool = False,
+) -> set[type[Model]]:
+    """Save serialized objects grouped by model, referenced models first.
+
+    objects_loaded is sent for every model. Return models of the saved
+    objects.
+    """
+    by_model = defaultdict(list)
+    for item in serializers.deserialize(
+        'python', objects, using=using, ignorenonexistent=ignorenonexistent
+    ):
+        by_model[type(item.object)].append(item)
+    for model in sort_models(by_model):
+        if model._meta.parents:
+            # bulk_create does not support multi-table inheritance.
+            for item in by_model[model]:
+                item.save(using=using)
+            continue
+        for batch in batched(by_model[model], batch_size):
+            save_batch(model, batch, using)
+    for model, items in by_model.items():
+        objects_loaded.send(
+            sender=model,
+            pks=[
+                item.object.pk for item in items if item.object.pk is not None
+            ],
+            using=using,
+        )
+    return set(by_model)
+
+
+def iter_serialized(
+    model: type[Model], using: str, chunk_size: int
+) -> Iterator[dict]:
+    """Yield objects of the model serialized to dumpdata dicts."""
+    serializer = serializers.get_serializer('python')()
+    queryset = (
+        model._base_manager.using(using)
+        .order_by(model._meta.pk.name)
+        .iterator(chunk_size=chunk_size)
+    )
+    for batch in batched(queryset, chunk_size):
+        yield from serializer.serialize(batch)
+
+
+def write_json_array(items: Iterable[dict], file: IO[str]) -> int:
+    """Write items as a JSON array formatted like dumpdata --indent 2.
+
+    Return the number of written items.
+    """
+    file.write('[')
+    count = 0
+    for item in items:
+        file.write(',\n' if count else '\n')
+        file.write(
+            json.dumps(
+                item, indent=2, ensure_ascii=False, cls=DjangoJSONEncoder
+            )
+        )
+        count += 1
+    file.write('\n]\n')
+    return count
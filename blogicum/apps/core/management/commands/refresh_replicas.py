@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from core.db import copy_sqlite_database
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the default SQLite database to DATABASE_REPLICAS, once or'
+        ' every --interval seconds.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--interval', type=float, default=None)
+
+    def handle(self, *args, **options) -> None:
+        while True:
+            start = time.perf_counter()
+            for alias in settings.DATABASE_REPLICAS:
+                copy_sqlite_database(DEFAULT_DB_ALIAS, alias)
+            self.stdout.write(
+                f'Refreshed {len(settings.DATABASE_REPLICAS)} replicas in'
+                f' {(time.perf_counter() - start) * 1000:.0f} ms'
+            )
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,68 @@
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from core.queries import normalize_sql
+
+
+def read_entries(path: Path) -> list[dict]:
+    """Return entries of the log and its rotated backups.
+
+    Lines which do not decode, such as the last one cut short by a crash
+    in the middle of a write, are skipped.
+    """
+    entries = []
+    for log_path in sorted(path.parent.glob(f'{path.name}*')):
+        with open(log_path, encoding='utf-8', errors='replace') as file:
+            for line in file:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    return entries
+
+
+class Command(BaseCommand):
+    help = 'Summarize the slow query log by statement shape.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--path', type=Path, default=None)
+        parser.add_argument('--top', type=int, default=10)
+
+    def handle(self, *args, **options) -> None:
+        path = options['path'] or Path(settings.SLOW_QUERY_LOG)
+        entries = read_entries(path)
+        if not entries:
+            self.stdout.write('No slow queries logged.')
+            return
+
+        groups = defaultdict(list)
+        for entry in entries:
+            groups[normalize_sql(entry['sql'])].append(entry)
+        offenders = sorted(
+            groups.items(),
+            key=lambda item: sum(entry['duration_ms'] for entry in item[1]),
+            reverse=True,
+        )
+        for shape, group in offenders[: options['top']]:
+            durations = [entry['duration_ms'] for entry in group]
+            functions = Counter(entry['function'] for entry in group)
+            views = Counter(entry['view'] for entry in group)
+            self.stdout.write(
+                f'\n{sum(durations):.1f} ms total, {len(group)} times,'
+                f' max {max(durations):.1f} ms'
+            )
+            self.stdout.write(f'  {shape}')
+            self.stdout.write(
+                '  from '
+                + ', '.join(f'{name} ({n})' for name, n in functions.items())
+            )
+            self.stdout.write(
+                '  views '
+                + ', '.join(f'{name} ({n})' for name, n in views.items())
+            )
+            for line in group[-1]['plan']:
+                self.stdout.write(f'    {line}')
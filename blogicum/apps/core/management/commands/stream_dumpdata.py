@@ -0,0 +1,100 @@
+import itertools
+from collections.abc import Iterator
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import DEFAULT_DB_ALIAS, router
+from django.db.models import Model
+
+from core.fixtures import (
+    iter_serialized,
+    open_fixture,
+    sort_models,
+    write_json_array,
+)
+
+
+def resolve_models(labels: list[str]) -> set[type[Model]]:
+    """Return models of app_label and app_label.ModelName labels."""
+    models = set()
+    try:
+        for label in labels:
+            if '.' in label:
+                models.add(apps.get_model(label))
+            else:
+                models.update(apps.get_app_config(label).get_models())
+    except LookupError as error:
+        raise CommandError(str(error))
+    return models
+
+
+class Command(BaseCommand):
+    help = (
+        'Dump the database in dumpdata JSON format, writing objects as'
+        ' they are read. Referenced models are dumped first.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            'app_label[.ModelName]',
+            nargs='*',
+            help='Models to dump, all by default.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('-e', '--exclude', action='append', default=[])
+        parser.add_argument(
+            '-o',
+            '--output',
+            type=Path,
+            default=None,
+            help='File to write, compressed when it ends with .gz.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options) -> None:
+        using = options['database']
+        labels = options['app_label[.ModelName]']
+        models = (
+            resolve_models(labels) if labels else set(apps.get_models())
+        ) - resolve_models(options['exclude'])
+        models = [
+            model
+            for model in sort_models(models)
+            if model._meta.managed
+            and not model._meta.proxy
+            and router.allow_migrate_model(using, model)
+        ]
+        items = itertools.chain.from_iterable(
+            iter_serialized(model, using, options['chunk_size'])
+            for model in models
+        )
+        output = options['output']
+        if output is not None:
+            items = self.report_progress(items, options['chunk_size'])
+        else:
+            # Items are written in parts, as dumpdata does.
+            self.stdout.ending = None
+        with (
+            open_fixture(output, 'w')
+            if output is not None
+            else nullcontext(self.stdout)
+        ) as file:
+            count = write_json_array(items, file)
+        if output is not None:
+            self.stdout.write(
+                self.style.SUCCESS(f'Dumped {count} objects to {output}.')
+            )
+
+    def report_progress(
+        self, items: Iterator[dict], every: int
+    ) -> Iterator[dict]:
+        for count, item in enumerate(items, 1):
+            yield item
+            if count % every == 0:
+                self.stdout.write(f'{count} objects dumped')
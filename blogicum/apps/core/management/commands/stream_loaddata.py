@@ -0,0 +1,99 @@
+import itertools
+import time
+from pathlib import Path
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.core.management.color import no_style
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    IntegrityError,
+    connections,
+    transaction,
+)
+
+from core.cache import bump_all
+from core.fixtures import JSONArrayReader, load_objects, open_fixture
+from core.utils import batched
+
+
+class Command(BaseCommand):
+    help = (
+        'Load a dumpdata JSON fixture of any size. Objects are parsed one'
+        ' by one and inserted with bulk_create in chunked transactions.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('fixture', type=Path)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Objects inserted by one statement.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Objects saved in one transaction.',
+        )
+        parser.add_argument(
+            '--offset',
+            type=int,
+            default=0,
+            help='Skip objects saved by an interrupted run.',
+        )
+        parser.add_argument('-i', '--ignorenonexistent', action='store_true')
+
+    def handle(self, *args, **options) -> None:
+        using = options['database']
+        connection = connections[using]
+        offset = loaded = options['offset']
+        models = set()
+        start = time.perf_counter()
+        # Chunks may refer to objects of later ones, so references are
+        # checked at the end, like loaddata does.
+        with open_fixture(
+            options['fixture'], 'r'
+        ) as file, connection.constraint_checks_disabled():
+            objects = itertools.islice(JSONArrayReader(file), offset, None)
+            for chunk in batched(objects, options['chunk_size']):
+                with transaction.atomic(using=using):
+                    models |= load_objects(
+                        chunk,
+                        using,
+                        options['batch_size'],
+                        options['ignorenonexistent'],
+                    )
+                loaded += len(chunk)
+                rate = (loaded - offset) / (time.perf_counter() - start)
+                self.stdout.write(
+                    f'{loaded} objects loaded, {rate:.0f} per second,'
+                    f' resume with --offset {loaded}'
+                )
+
+        try:
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in models]
+            )
+        except IntegrityError as error:
+            raise CommandError(
+                f'Loaded objects refer to missing ones: {error}'
+            )
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+        # Objects are saved without signals, so everything cached with
+        # versions is invalidated in the shared cache.
+        bump_all()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Loaded {loaded - offset} objects of {len(models)} models.'
+            )
+        )
@@ -0,0 +1,297 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.template.backends import django as django_backend
+
+# Histogram values of one thread or process by (metric name, view name):
+# observations per bucket, the last one is +Inf, followed by their sum.
+Samples = dict[tuple[str, str], list[float]]
+
+FILE_KEY_SEPARATOR = '\t'
+
+
+@dataclass(frozen=True)
+class Histogram:
+    name: str
+    help: str
+    buckets: tuple[float, ...]
+
+
+SECONDS_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)  # fmt: skip
+
+REQUEST_DURATION = Histogram(
+    'blogicum_request_duration_seconds',
+    'Time spent handling a request.',
+    SECONDS_BUCKETS,
+)
+SQL_DURATION = Histogram(
+    'blogicum_sql_duration_seconds',
+    'Time spent in SQL per request.',
+    SECONDS_BUCKETS,
+)
+SQL_QUERIES = Histogram(
+    'blogicum_sql_queries',
+    'SQL queries per request.',
+    (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 50, 100),
+)
+TEMPLATE_DURATION = Histogram(
+    'blogicum_template_render_seconds',
+    'Time spent rendering templates per request.',
+    SECONDS_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'blogicum_response_size_bytes',
+    'Size of response body.',
+    (256, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+HISTOGRAMS = {
+    histogram.name: histogram
+    for histogram in (
+        REQUEST_DURATION,
+        SQL_DURATION,
+        SQL_QUERIES,
+        TEMPLATE_DURATION,
+        RESPONSE_SIZE,
+    )
+}
+
+
+def merge_samples(target: Samples, source: Samples) -> None:
+    for key, values in source.items():
+        if key in target:
+            target[key] = [a + b for a, b in zip(target[key], values)]
+        else:
+            target[key] = list(values)
+
+
+class MetricsStore:
+    """Histograms of the process kept in a separate shard per thread.
+
+    Threads only write to their own shard, so observing takes no lock.
+    With a directory set, snapshots of every process are written there
+    and merged on collection, which covers pre-forked workers.
+    """
+
+    def __init__(self) -> None:
+        self._shards: list[Samples] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._flushed_at = 0.0
+
+    def _shard(self) -> Samples:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(self, histogram: Histogram, view: str, value: float) -> None:
+        shard = self._shard()
+        key = (histogram.name, view)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0.0] * (len(histogram.buckets) + 2)
+        values[bisect.bisect_left(histogram.buckets, value)] += 1
+        values[-1] += value
+
+    def snapshot(self) -> Samples:
+        """Return histograms of all threads of the process."""
+        samples: Samples = {}
+        for shard in list(self._shards):
+            merge_samples(
+                samples,
+                {key: list(values) for key, values in list(shard.items())},
+            )
+        return samples
+
+    def flush(self, directory: Path) -> None:
+        """Write snapshot of the process to the directory atomically."""
+        path = directory / f'{os.getpid()}.json'
+        temporary_path = path.with_suffix('.tmp')
+        temporary_path.write_text(
+            json.dumps(
+                {
+                    FILE_KEY_SEPARATOR.join(key): values
+                    for key, values in self.snapshot().items()
+                }
+            )
+        )
+        os.replace(temporary_path, path)
+        self._flushed_at = time.monotonic()
+
+    def maybe_flush(self) -> None:
+        directory = settings.METRICS_DIR
+        if (
+            directory is not None
+            and time.monotonic() - self._flushed_at
+            >= settings.METRICS_FLUSH_INTERVAL
+        ):
+            self.flush(Path(directory))
+
+    def collect(self) -> Samples:
+        """Return histograms of this process and flushed ones of others."""
+        samples = self.snapshot()
+        if settings.METRICS_DIR is None:
+            return samples
+        own_file = f'{os.getpid()}.json'
+        expired_before = time.time() - settings.METRICS_SNAPSHOT_TTL
+        for path in Path(settings.METRICS_DIR).glob('*.json'):
+            if path.name == own_file:
+                continue
+            try:
+                if path.stat().st_mtime < expired_before:
+                    # Left by a process which has exited long ago.
+                    path.unlink()
+                    continue
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            merge_samples(
+                samples,
+                {
+                    tuple(key.split(FILE_KEY_SEPARATOR, 1)): values
+                    for key, values in data.items()
+                },
+            )
+        return samples
+
+
+store = MetricsStore()
+
+
+def format_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def render_metrics(samples: Samples) -> str:
+    """Render histograms in Prometheus text exposition format."""
+    lines = []
+    for histogram in HISTOGRAMS.values():
+        lines.append(f'# HELP {histogram.name} {histogram.help}')
+        lines.append(f'# TYPE {histogram.name} histogram')
+        for (name, view), values in sorted(samples.items()):
+            if name != histogram.name:
+                continue
+            label = f'view="{format_label(view)}"'
+            cumulative = 0.0
+            bounds = [*map(format_bound, histogram.buckets), '+Inf']
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{{{label},le="{bound}"}} {cumulative:g}'
+                )
+            lines.append(f'{name}_sum{{{label}}} {values[-1]!r}')
+            lines.append(f'{name}_count{{{label}}} {cumulative:g}')
+    return '\n'.join(lines) + '\n'
+
+
+class RequestTimings(threading.local):
+    """Accumulated SQL and template time of the current request."""
+
+    active = False
+    rendering = False
+    sql_time = 0.0
+    sql_count = 0
+    template_time = 0.0
+
+
+timings = RequestTimings()
+
+
+def time_sql(
+    execute: Callable,
+    sql: str,
+    params: object,
+    many: bool,
+    context: dict,
+) -> object:
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.sql_time += time.perf_counter() - start
+        timings.sql_count += 1
+
+
+class Template(django_backend.Template):
+    def render(
+        self,
+        context: Optional[dict] = None,
+        request: Optional[HttpRequest] = None,
+    ) -> str:
+        if not timings.active or timings.rendering:
+            return super().render(context, request)
+        timings.rendering = True
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_time += time.perf_counter() - start
+            timings.rendering = False
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """Django template backend measuring render time for metrics."""
+
+    def from_string(self, template_code: str) -> Template:
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> Template:
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except django_backend.TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
+
+
+class MetricsMiddleware:
+    """Record request, SQL and template timing histograms by view name."""
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        timings.active = True
+        timings.sql_time = timings.template_time = 0.0
+        timings.sql_count = 0
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(time_sql))
+                response = self.get_response(request)
+        finally:
+            timings.active = False
+        duration = time.perf_counter() - start
+
+        view = (
+            request.resolver_match.view_name
+            if request.resolver_match
+            else 'unresolved'
+        )
+        store.observe(REQUEST_DURATION, view, duration)
+        store.observe(SQL_DURATION, view, timings.sql_time)
+        store.observe(SQL_QUERIES, view, timings.sql_count)
+        store.observe(TEMPLATE_DURATION, view, timings.template_time)
+        if not response.streaming:
+            store.observe(RESPONSE_SIZE, view, len(response.content))
+        store.maybe_flush()
+        return response
@@ -0,0 +1,162 @@
+import cProfile
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Callable
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+ORM = 'orm'
+TEMPLATE = 'template'
+VIEW = 'view'
+LIBRARY_PATH_RE = re.compile(r'^.*/(site-packages|lib/python\d+\.\d+)/')
+CATEGORY_PATHS = (
+    (ORM, ('django/db/',)),
+    (TEMPLATE, ('django/template/', 'django/templatetags/')),
+)
+
+
+def frame_label(frame: FrameType) -> str:
+    """Return short file path and function name of the frame."""
+    filename = LIBRARY_PATH_RE.sub('', frame.f_code.co_filename)
+    base_dir = f'{settings.BASE_DIR}/'
+    if filename.startswith(base_dir):
+        filename = filename[len(base_dir) :]
+    return f'{filename}:{frame.f_code.co_name}'
+
+
+def classify(labels: list[str]) -> str:
+    """Return whether the innermost known frame is ORM or template code."""
+    for label in reversed(labels):
+        for category, paths in CATEGORY_PATHS:
+            if any(path in label for path in paths):
+                return category
+    return VIEW
+
+
+class StackSampler:
+    """Thread which periodically records the stack of another thread."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> 'StackSampler':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            labels.reverse()
+            if labels:
+                self.stacks[(classify(labels), *labels)] += 1
+
+    def collapsed(self) -> str:
+        """Return stacks in collapsed format used by flamegraph tools."""
+        return ''.join(
+            f'{";".join(stack)} {count}\n'
+            for stack, count in self.stacks.most_common()
+        )
+
+    def time_by_category(self, duration: float) -> dict[str, float]:
+        """Split duration between ORM, template and view code.
+
+        Samples are taken less often than the interval when the profiled
+        thread holds the GIL, so their shares are used, not their count.
+        """
+        seconds = dict.fromkeys((ORM, TEMPLATE, VIEW), 0.0)
+        total = sum(self.stacks.values())
+        if not total:
+            return seconds
+        for stack, count in self.stacks.items():
+            seconds[stack[0]] += duration * count / total
+        return seconds
+
+
+class ProfilerMiddleware:
+    """Profile requests of staff or with an allowlisted token on demand.
+
+    Requests with the PROFILER_HEADER header run under cProfile and a
+    stack sampler. The .prof file and the collapsed stacks split into
+    ORM, template and view code are saved to PROFILER_DIR. The middleware
+    is removed when PROFILER_ENABLED is off.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = 'HTTP_' + settings.PROFILER_HEADER.upper().replace(
+            '-', '_'
+        )
+
+    def should_profile(self, request: HttpRequest) -> bool:
+        token = request.META.get(self.header)
+        return token is not None and (
+            token in settings.PROFILER_TOKENS or request.user.is_staff
+        )
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        sampler = StackSampler(
+            threading.get_ident(), settings.PROFILER_SAMPLE_INTERVAL
+        )
+        start = time.perf_counter()
+        with sampler:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration = time.perf_counter() - start
+
+        directory = Path(settings.PROFILER_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f'{time.strftime("%Y%m%d-%H%M%S")}-{slugify(request.path)}'
+        name = f'{name}-{uuid4().hex[:8]}'
+        profiler.dump_stats(directory / f'{name}.prof')
+        (directory / f'{name}.collapsed').write_text(sampler.collapsed())
+
+        summary = ' '.join(
+            f'{category}={seconds * 1000:.0f}ms'
+            for category, seconds in sampler.time_by_category(duration).items()
+        )
+        logger.info(
+            'Profiled %s %s in %.0fms (%s), saved as %s',
+            request.method,
+            request.path,
+            duration * 1000,
+            summary,
+            name,
+        )
+        response['X-Profile-Id'] = name
+        response['X-Profile-Summary'] = (
+            f'total={duration * 1000:.0f}ms {summary}'
+        )
+        return response
@@ -0,0 +1,216 @@
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from types import FrameType
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+PARAMS_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+SHAPE_DISPLAY_LEN = 120
+UNKNOWN_CALLER = 'unknown'
+# Django function calling execute wrappers of a cursor.
+WRAPPERS_CALLER = '_execute_with_wrappers'
+# Transaction control differs between tests and production and is cheap.
+TRANSACTION_RE = re.compile(
+    r'\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b', re.IGNORECASE
+)
+
+
+class QueryBudgetExceeded(Exception):
+    """Request or block ran more or more repetitive queries than allowed."""
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    duration: float
+    location: str
+
+    @property
+    def shape(self) -> str:
+        return normalize_sql(self.sql)
+
+
+def normalize_sql(sql: str) -> str:
+    """Replace literals and parameter lists so equal queries match."""
+    sql = PARAMS_LIST_RE.sub('(...)', LITERAL_RE.sub('?', sql))
+    return ' '.join(sql.split())
+
+
+def query_caller_frames() -> Iterator[FrameType]:
+    """Yield frames which ran the current query from the innermost one.
+
+    Frames of execute wrappers, including the calling one, are skipped.
+    """
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_name != WRAPPERS_CALLER:
+        frame = frame.f_back
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def find_caller() -> str:
+    """Return template line or project code line which ran the query.
+
+    Template nodes win over the view which rendered them, so queries
+    made by templates are told apart.
+    """
+    apps_path = str(settings.APPS_PATH)
+    for frame in query_caller_frames():
+        code = frame.f_code
+        if code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            if origin is not None:
+                return f'{origin.template_name}:{node.token.lineno}'
+        elif code.co_filename.startswith(apps_path):
+            return f'{code.co_filename[len(apps_path) + 1 :]}:{frame.f_lineno}'
+    return UNKNOWN_CALLER
+
+
+class QueryRecorder:
+    """Context manager recording queries to every database.
+
+    Transaction control statements are not recorded. Without
+    find_callers the stack is not walked and every location is unknown.
+    """
+
+    def __init__(self, find_callers: bool = True) -> None:
+        self.queries: list[RecordedQuery] = []
+        self.find_callers = find_callers
+        self._stack = ExitStack()
+
+    def __enter__(self) -> 'QueryRecorder':
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+    def __call__(
+        self,
+        execute: Callable,
+        sql: str,
+        params: object,
+        many: bool,
+        context: dict,
+    ) -> object:
+        if TRANSACTION_RE.match(sql):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                RecordedQuery(
+                    sql,
+                    time.perf_counter() - start,
+                    find_caller() if self.find_callers else UNKNOWN_CALLER,
+                )
+            )
+
+    def repeated(self, limit: int) -> list[tuple[str, str, int]]:
+        """Return (shape, location, count) of queries run limit+ times."""
+        counts = Counter(
+            (query.shape, query.location) for query in self.queries
+        )
+        return [
+            (shape, location, count)
+            for (shape, location), count in counts.most_common()
+            if count >= limit
+        ]
+
+    def problems(self, budget: Optional[int], repeat_limit: int) -> list[str]:
+        """Describe exceeded budget and N+1 suspects, if any."""
+        problems = []
+        if budget is not None and len(self.queries) > budget:
+            problems.append(
+                f'{len(self.queries)} queries, budget is {budget}:'
+            )
+            problems.extend(
+                f'  {query.location}: {query.shape[:SHAPE_DISPLAY_LEN]}'
+                for query in self.queries
+            )
+        problems.extend(
+            f'N+1: {count} times at {location}: {shape}'
+            for shape, location, count in self.repeated(repeat_limit)
+        )
+        return problems
+
+
+def check_problems(problems: list[str], title: str, strict: bool) -> None:
+    if not problems:
+        return
+    message = '\n'.join([title, *(f'  {problem}' for problem in problems)])
+    if strict:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+@contextmanager
+def assert_query_budget(
+    max_queries: Optional[int] = None, repeat_limit: Optional[int] = None
+) -> Iterator[QueryRecorder]:
+    """Raise QueryBudgetExceeded if the block breaks the budget.
+
+    Test helper like assertNumQueries, which also reports repeated
+    queries with the same shape and caller as N+1.
+    """
+    if repeat_limit is None:
+        repeat_limit = settings.QUERY_REPEAT_LIMIT
+    with QueryRecorder() as recorder:
+        yield recorder
+    check_problems(
+        recorder.problems(max_queries, repeat_limit),
+        'Query budget exceeded',
+        strict=True,
+    )
+
+
+class QueryBudgetMiddleware:
+    """Check queries of every request against QUERY_BUDGETS.
+
+    Problems are logged, or raised when QUERY_BUDGETS_STRICT is on.
+    Finding callers walks the stack on every query, so it is done only
+    with QUERY_BUDGETS_FIND_CALLERS. Without them N+1 suspects are
+    repeated queries of the same shape from anywhere.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.QUERY_BUDGETS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        find_callers = settings.QUERY_BUDGETS_FIND_CALLERS
+        with QueryRecorder(find_callers) as recorder:
+            response = self.get_response(request)
+        view_name = (
+            request.resolver_match.view_name
+            if request.resolver_match
+            else None
+        )
+        check_problems(
+            recorder.problems(
+                settings.QUERY_BUDGETS.get(view_name),
+                settings.QUERY_REPEAT_LIMIT,
+            ),
+            f'Query budget exceeded by {request.method} {request.path}'
+            f' ({view_name})',
+            strict=settings.QUERY_BUDGETS_STRICT,
+        )
+        return response
@@ -0,0 +1,104 @@
+import random
+import threading
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+# Apps whose models are always read from the default database.
+PRIMARY_APPS = ('auth', 'sessions')
+
+
+class ReplicaState(threading.local):
+    """Replica the current request reads from, None for the default."""
+
+    replica: Optional[str] = None
+    wrote = False
+
+
+state = ReplicaState()
+
+
+class ReplicaReadsMixin:
+    """Mixin marking a read-only view, whose reads may go to a replica.
+
+    Replicas lag behind cache version bumps, so output rendered from
+    them, pages and post card fragments, is not cached under version
+    stamps: see state.replica.
+    """
+
+    replica_reads = True
+
+
+def uses_replicas(view_func: Callable) -> bool:
+    view = getattr(view_func, 'view_class', view_func)
+    return getattr(view, 'replica_reads', False)
+
+
+class ReplicaRouter:
+    """Send reads of read-only views to DATABASE_REPLICAS.
+
+    Everything else, writes included, goes to the default database, and
+    so do sessions and users: a user who has just logged in must not look
+    logged out. Replicas are copies of it, so nothing is migrated there.
+    """
+
+    def db_for_read(self, model: type[Model], **hints) -> Optional[str]:
+        if model._meta.app_label in PRIMARY_APPS or (
+            model._meta.label == settings.AUTH_USER_MODEL
+        ):
+            return None
+        return state.replica
+
+    def db_for_write(self, model: type[Model], **hints) -> Optional[str]:
+        state.wrote = True
+        return None
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> bool:
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        return {obj1._state.db, obj2._state.db} <= databases
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool:
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """Let read-only views read from replicas, unless the user just wrote.
+
+    A request which writes sets the REPLICA_PIN_COOKIE cookie for
+    REPLICA_PIN_SECONDS, and requests with it read from the default
+    database, so users see their changes before replicas catch up.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        state.replica = None
+        state.wrote = False
+        try:
+            response = self.get_response(request)
+        finally:
+            state.replica = None
+        if state.wrote:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(
+        self, request: HttpRequest, view_func: Callable, *args, **kwargs
+    ) -> None:
+        # One replica serves the whole request, as replicas may have been
+        # refreshed at different times.
+        if (
+            settings.DATABASE_REPLICAS
+            and uses_replicas(view_func)
+            and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+        ):
+            state.replica = random.choice(settings.DATABASE_REPLICAS)
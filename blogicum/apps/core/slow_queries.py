@@ -0,0 +1,152 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.http import HttpRequest, HttpResponse
+
+from core.queries import query_caller_frames
+
+logger = logging.getLogger(__name__)
+
+EXPLAINED_STATEMENTS = ('SELECT', 'WITH')
+
+
+class SlowQueryState(threading.local):
+    view_name: Optional[str] = None
+
+
+state = SlowQueryState()
+_handler: Optional[RotatingFileHandler] = None
+_handler_lock = threading.Lock()
+
+
+def find_app_frame() -> tuple[str, str]:
+    """Return line and function of the innermost project frame."""
+    apps_path = str(settings.APPS_PATH)
+    for frame in query_caller_frames():
+        code = frame.f_code
+        if code.co_filename.startswith(apps_path):
+            path = code.co_filename[len(apps_path) + 1 :]
+            function = getattr(code, 'co_qualname', code.co_name)
+            return f'{path}:{frame.f_lineno}', f'{path}:{function}'
+    return 'unknown', 'unknown'
+
+
+def explain(
+    connection: BaseDatabaseWrapper, sql: str, params: object
+) -> list[str]:
+    """Return query plan of a read statement, empty for other ones."""
+    if not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+        return []
+    prefix = (
+        'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    )
+    try:
+        with connection.cursor() as cursor:
+            # Backend cursor runs the statement without execute wrappers.
+            cursor.cursor.execute(f'{prefix} {sql}', params)
+            return [str(row[-1]) for row in cursor.cursor.fetchall()]
+    except Exception as error:
+        return [f'EXPLAIN failed: {error}']
+
+
+def get_handler() -> RotatingFileHandler:
+    """Return handler of the slow query log, opened on first use."""
+    global _handler
+    path = Path(settings.SLOW_QUERY_LOG)
+    with _handler_lock:
+        if _handler is None or Path(_handler.baseFilename) != path.resolve():
+            if _handler is not None:
+                _handler.close()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _handler = RotatingFileHandler(
+                path,
+                maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                encoding='utf-8',
+            )
+        return _handler
+
+
+def write_entry(entry: dict) -> None:
+    handler = get_handler()
+    handler.handle(
+        logging.makeLogRecord(
+            {
+                'name': logger.name,
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': json.dumps(entry, ensure_ascii=False, default=str),
+            }
+        )
+    )
+
+
+def log_slow_query(
+    execute: Callable,
+    sql: str,
+    params: object,
+    many: bool,
+    context: dict,
+) -> object:
+    """Execute wrapper which logs statements slower than the threshold."""
+    threshold = settings.SLOW_QUERY_THRESHOLD
+    if threshold is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        if duration >= threshold:
+            location, function = find_app_frame()
+            connection = context['connection']
+            write_entry(
+                {
+                    'time': datetime.now(timezone.utc).isoformat(),
+                    'duration_ms': round(duration * 1000, 3),
+                    'sql': sql,
+                    'params': params,
+                    'many': many,
+                    'database': connection.alias,
+                    'view': state.view_name,
+                    'location': location,
+                    'function': function,
+                    'plan': (
+                        explain(connection, sql, params)
+                        if settings.SLOW_QUERY_EXPLAIN and not many
+                        else []
+                    ),
+                }
+            )
+
+
+def install_slow_query_logger(
+    sender: type, connection: BaseDatabaseWrapper, **kwargs
+) -> None:
+    """Add the logging wrapper to a new database connection."""
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, log_slow_query)
+
+
+class SlowQueryMiddleware:
+    """Remember view name of the current request for the slow query log."""
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        try:
+            return self.get_response(request)
+        finally:
+            state.view_name = None
+
+    def process_view(self, request: HttpRequest, *args, **kwargs) -> None:
+        state.view_name = request.resolver_match.view_name
@@ -0,0 +1,12 @@
+import itertools
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+T = TypeVar('T')
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yield lists of up to size consecutive items."""
+    items = iter(items)
+    while batch := list(itertools.islice(items, size)):
+        yield batch
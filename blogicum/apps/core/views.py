@@ -1,10 +1,14 @@
+from django.conf import settings
 from django.contrib.auth import login
 from django.contrib.auth.forms import UserCreationForm
-from django.http import HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.views.decorators.http import require_GET
 from django.views.generic import CreateView
 
+from core.metrics import render_metrics, store
+
 
 class Registration(CreateView):
     template_name = 'registration/registration_form.html'
@@ -17,3 +21,26 @@ class Registration(CreateView):
         login(self.request, user)
 
         return redirect(self.success_url)
+
+
+def can_see_metrics(request: HttpRequest) -> bool:
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() == 'bearer' and token in settings.METRICS_TOKENS:
+        return True
+    if (
+        settings.METRICS_TRUST_INTERNAL_IPS
+        and request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS
+    ):
+        return True
+    return request.user.is_staff
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Show metrics in Prometheus format to staff and scrapers."""
+    if not can_see_metrics(request):
+        raise Http404
+    return HttpResponse(
+        render_metrics(store.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -2,12 +2,15 @@ from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from core.cache import AnonymousPageCacheMixin
+from core.routers import ReplicaReadsMixin
 
-class About(TemplateView):
+
+class About(ReplicaReadsMixin, AnonymousPageCacheMixin, TemplateView):
     template_name = 'pages/about.html'
 
 
-class Rules(TemplateView):
+class Rules(ReplicaReadsMixin, AnonymousPageCacheMixin, TemplateView):
     template_name = 'pages/rules.html'
 
 
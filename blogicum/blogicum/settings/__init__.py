@@ -0,0 +1,21 @@
+"""Settings of the profile chosen by DJANGO_SETTINGS_PROFILE.
+
+Profiles are 'development' (default) and 'production'.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILES = ('development', 'production')
+
+_profile = os.environ.get('DJANGO_SETTINGS_PROFILE', 'development')
+if _profile == 'production':
+    from blogicum.settings.production import *  # noqa: F403
+elif _profile == 'development':
+    from blogicum.settings.development import *  # noqa: F403
+else:
+    raise ImproperlyConfigured(
+        f'Unknown DJANGO_SETTINGS_PROFILE {_profile!r},'
+        f' expected one of {", ".join(PROFILES)}.'
+    )
@@ -0,0 +1,235 @@
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+APPS_PATH = BASE_DIR / 'apps'
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+STATICFILES_DIRS = [BASE_DIR / 'static_dev']
+MEDIA_ROOT = BASE_DIR / 'media'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+sys.path.insert(0, str(APPS_PATH))
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+# Pagination of post lists by view name: 'offset' or 'cursor'.
+# Cursor pagination does not count posts and does not use OFFSET,
+# so deep pages stay fast, but page numbers are not shown.
+POSTS_PAGINATION_MODES = {
+    'blog:index': 'offset',
+    'blog:category_posts': 'offset',
+    'blog:profile': 'offset',
+}
+
+# Comments shown on the post page at once, the rest are loaded on demand.
+COMMENTS_PAGE_SIZE = 50
+
+# Seconds to keep pages rendered for anonymous users, 0 disables caching.
+# Pages are invalidated on changes, timeout only bounds the delay before
+# scheduled posts show up.
+PAGE_CACHE_TIMEOUT = 60
+
+# Most queries a request of the view may run. Requests running the same
+# query from the same place QUERY_REPEAT_LIMIT times are reported as N+1.
+# Problems are logged, or raised when QUERY_BUDGETS_STRICT is on.
+# Checked only with QUERY_BUDGETS_ENABLED. QUERY_BUDGETS_FIND_CALLERS
+# names the code which ran every query, at the cost of a stack walk.
+QUERY_BUDGETS_ENABLED = False
+QUERY_BUDGETS_FIND_CALLERS = True
+QUERY_BUDGETS = {
+    'blog:index': 5,
+    'blog:category_posts': 6,
+    'blog:post_detail': 5,
+    'blog:post_comments': 5,
+    'blog:profile': 6,
+    'blog:search': 5,
+    'blog:add_comment': 6,
+    'blog:edit_post': 8,
+    'blog:delete_post': 8,
+    'blog:edit_comment': 5,
+    'blog:delete_comment': 5,
+}
+QUERY_REPEAT_LIMIT = 3
+QUERY_BUDGETS_STRICT = False
+
+# Request, SQL and template timing histograms shown at /metrics/.
+# Worker processes write their metrics to METRICS_DIR every
+# METRICS_FLUSH_INTERVAL seconds, so any worker can show all of them.
+# None keeps metrics of a single process in memory.
+METRICS_ENABLED = True
+METRICS_DIR = None
+METRICS_FLUSH_INTERVAL = 5
+# Snapshots not updated for this many seconds are deleted on collection.
+METRICS_SNAPSHOT_TTL = 24 * 60 * 60
+# Metrics are shown to staff, to requests with one of METRICS_TOKENS as
+# a bearer token and, when METRICS_TRUST_INTERNAL_IPS is on, to
+# INTERNAL_IPS.
+METRICS_TOKENS = []
+METRICS_TRUST_INTERNAL_IPS = True
+
+# Requests with the PROFILER_HEADER header from staff, or with one of
+# PROFILER_TOKENS as its value, are profiled and the profile is saved to
+# PROFILER_DIR. When disabled, the profiler middleware is not loaded.
+# Enabled in the development profile, in production see its settings.
+PROFILER_ENABLED = False
+PROFILER_HEADER = 'X-Profile'
+PROFILER_TOKENS = []
+PROFILER_DIR = BASE_DIR / 'profiles'
+PROFILER_SAMPLE_INTERVAL = 0.001
+
+# Statements running SLOW_QUERY_THRESHOLD seconds or longer are written to
+# the rotating JSON lines SLOW_QUERY_LOG with their plan and the code
+# that ran them, see the slow_queries command. None disables the log.
+SLOW_QUERY_THRESHOLD = 0.1
+SLOW_QUERY_EXPLAIN = True
+SLOW_QUERY_LOG = BASE_DIR / 'logs' / 'slow_queries.jsonl'
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 5
+
+# Database aliases read-only views read from, chosen at random. Requests
+# which write pin the user to the default database for
+# REPLICA_PIN_SECONDS through the REPLICA_PIN_COOKIE cookie.
+DATABASE_REPLICAS = []
+REPLICA_PIN_SECONDS = 10
+REPLICA_PIN_COOKIE = 'replica_pin'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+LOGIN_URL = 'login'
+
+
+# Name of the profile module these settings are extended by.
+SETTINGS_PROFILE = 'base'
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'django-insecure-!7*@)^5s61(g95-10$1e2z(hkr55xgho@4y*r@0(s#un@izt+-'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = ['localhost', '127.0.0.1']
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    # Third-party
+    'django_bootstrap5',
+    # ----------
+    'core',
+    'pages',
+    'blog',
+]
+
+MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'core.queries.QueryBudgetMiddleware',
+    'core.slow_queries.SlowQueryMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.profiling.ProfilerMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'core.metrics.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'core.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Run on every new connection. WAL lets readers work while
+            # a write is in progress.
+            'pragmas': {
+                'journal_mode': 'wal',
+                'synchronous': 'normal',
+                'mmap_size': 256 * 1024 * 1024,
+                'cache_size': -64 * 1024,
+                'busy_timeout': 5000,
+            },
+            # Threads of the process queue up for writing instead of
+            # failing with "database is locked".
+            'serialize_writes': True,
+        },
+    }
+}
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Version stamps in the cache invalidate pages and fragments cached by
+# every worker, so all of them must share one cache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+STATIC_URL = '/static/'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
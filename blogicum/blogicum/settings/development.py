@@ -0,0 +1,40 @@
+import os
+
+from blogicum.settings.base import *  # noqa: F403
+from blogicum.settings.base import (
+    BASE_DIR,
+    DATABASES,
+    INSTALLED_APPS,
+    MIDDLEWARE,
+)
+
+SETTINGS_PROFILE = 'development'
+
+DEBUG = True
+
+INSTALLED_APPS = [*INSTALLED_APPS, 'debug_toolbar']
+
+MIDDLEWARE = [*MIDDLEWARE, 'debug_toolbar.middleware.DebugToolbarMiddleware']
+
+PROFILER_ENABLED = True
+QUERY_BUDGETS_ENABLED = True
+
+# DJANGO_SQLITE_REPLICAS=<count> adds SQLite copies of the database as
+# replicas, refreshed with the refresh_replicas command.
+DATABASE_REPLICAS = [
+    f'replica_{number}'
+    for number in range(
+        1, int(os.environ.get('DJANGO_SQLITE_REPLICAS', 0)) + 1
+    )
+]
+DATABASES = {
+    **DATABASES,
+    **{
+        alias: {
+            **DATABASES['default'],
+            'NAME': BASE_DIR / f'db.{alias}.sqlite3',
+            'TEST': {'MIRROR': 'default'},
+        }
+        for alias in DATABASE_REPLICAS
+    },
+}
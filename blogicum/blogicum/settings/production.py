@@ -0,0 +1,79 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from blogicum.settings.base import *  # noqa: F403
+from blogicum.settings.base import BASE_DIR, CACHES, DATABASES, TEMPLATES
+
+
+def env_list(name: str) -> list[str]:
+    """Return comma separated values of the environment variable."""
+    return [value for value in os.environ.get(name, '').split(',') if value]
+
+
+SETTINGS_PROFILE = 'production'
+
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY for production.')
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+
+# Templates are compiled once per process instead of on every render.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                (
+                    'django.template.loaders.cached.Loader',
+                    [
+                        'django.template.loaders.filesystem.Loader',
+                        'django.template.loaders.app_directories.Loader',
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+    }
+}
+
+# Workers of the host share the file cache in DJANGO_CACHE_DIR.
+CACHES = {
+    'default': {
+        **CACHES['default'],
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_DIR', CACHES['default']['LOCATION']
+        ),
+    }
+}
+
+STATIC_ROOT = BASE_DIR / 'static'
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
+
+METRICS_DIR = os.environ.get('DJANGO_METRICS_DIR')
+# Behind a local reverse proxy every request comes from 127.0.0.1.
+METRICS_TRUST_INTERNAL_IPS = False
+METRICS_TOKENS = env_list('DJANGO_METRICS_TOKENS')
+
+# DJANGO_PROFILER_ENABLED=1 lets staff and requests carrying one of
+# DJANGO_PROFILER_TOKENS profile requests.
+PROFILER_ENABLED = os.environ.get('DJANGO_PROFILER_ENABLED') == '1'
+PROFILER_TOKENS = env_list('DJANGO_PROFILER_TOKENS')
+
+# Exceeded budgets are logged, callers are not looked up for speed.
+QUERY_BUDGETS_ENABLED = True
+QUERY_BUDGETS_FIND_CALLERS = False
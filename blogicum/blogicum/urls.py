@@ -3,7 +3,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from core.views import Registration
+from core.views import Registration, metrics
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_failure'
@@ -18,12 +18,15 @@ urlpatterns = [
     ),
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls')),
+    path('metrics/', metrics, name='metrics'),
 ]
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
 
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
+
+if settings.DEBUG:
     urlpatterns += [
         *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     ]
@@ -41,6 +41,41 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def strict_query_budgets():
+    with override_settings(QUERY_BUDGETS_STRICT=True):
+        yield
+
+
+def pytest_configure(config):
+    # Keeps the development cache in the source tree out of the tests.
+    # Set before collection, which already touches the cache.
+    from django.conf import settings
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tests",
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="session")
+def private_slow_query_log(tmp_path_factory):
+    # Slow statements of tests must not reach the log in the source tree.
+    log = tmp_path_factory.mktemp("logs") / "slow_queries.jsonl"
+    with override_settings(SLOW_QUERY_LOG=log):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,128 @@
+import pytest
+
+from blog import cache
+from blog.models import Post
+from core.bulk import bulk_update
+from core.cache import get_versions
+from core.queries import QueryRecorder
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def run_action(django_capture_on_commit_callbacks):
+    def run(client, model, action, selected, **data):
+        with django_capture_on_commit_callbacks(execute=True):
+            return client.post(
+                f"/admin/blog/{model}/",
+                {
+                    "action": action,
+                    "_selected_action": [obj.pk for obj in selected],
+                    "index": 0,
+                    **data,
+                },
+            )
+
+    return run
+
+
+def test_publish_updates_whole_selection_at_once(
+    admin_client, mixer, published_category, run_action
+):
+    posts = mixer.cycle(5).blend(
+        "blog.Post", is_published=False, category=published_category
+    )
+    versions = get_versions([cache.POSTS, cache.post(posts[0].pk)])
+    with QueryRecorder() as recorder:
+        response = run_action(
+            admin_client, "post", "publish", posts[:1], select_across=1
+        )
+    assert response.status_code == 302
+    assert not Post.objects.filter(is_published=False).exists()
+    updates = [
+        query for query in recorder.queries if query.sql.startswith("UPDATE")
+    ]
+    assert len(updates) == 1, (
+        "Убедитесь, что действие обновляет выбранные строки одним запросом."
+    )
+    assert get_versions(versions) != versions
+
+
+def test_unpublishing_comments_updates_counters(
+    admin_client, mixer, post_with_published_location, run_action
+):
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location, is_published=True
+    )
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.comment_count == 3
+
+    run_action(admin_client, "comment", "unpublish", comments[:2])
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.comment_count == 1, (
+        "Убедитесь, что счётчик комментариев обновляется после действия."
+    )
+
+
+def test_move_to_category(
+    admin_client, mixer, post_with_published_location, run_action
+):
+    old_category = post_with_published_location.category
+    new_category = mixer.blend("blog.Category")
+    versions = get_versions(
+        [
+            cache.category_posts(old_category.pk),
+            cache.category_posts(new_category.pk),
+        ]
+    )
+    selected = [post_with_published_location]
+
+    response = run_action(admin_client, "post", "move_to_category", selected)
+    assert response.status_code == 200
+    assert new_category.title in response.content.decode()
+
+    run_action(
+        admin_client,
+        "post",
+        "move_to_category",
+        selected,
+        apply="yes",
+        category=new_category.pk,
+    )
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.category == new_category
+    new_versions = get_versions(versions)
+    assert all(new_versions[key] != versions[key] for key in versions), (
+        "Убедитесь, что кэш обеих категорий сбрасывается."
+    )
+
+
+def test_clear_location(
+    admin_client, post_with_published_location, run_action
+):
+    run_action(
+        admin_client, "post", "clear_location", [post_with_published_location]
+    )
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.location is None
+
+
+def test_caches_are_invalidated_after_commit(
+    mixer, published_category, django_capture_on_commit_callbacks
+):
+    posts = mixer.cycle(2).blend(
+        "blog.Post", is_published=False, category=published_category
+    )
+    versions = get_versions([cache.POSTS])
+    with django_capture_on_commit_callbacks() as callbacks:
+        bulk_update(
+            Post.objects.filter(pk__in=[post.pk for post in posts]),
+            is_published=True,
+        )
+        assert get_versions(versions) == versions, (
+            "Убедитесь, что кеш сбрасывается только после фиксации"
+            " транзакции."
+        )
+    for callback in callbacks:
+        callback()
+    assert get_versions(versions) != versions
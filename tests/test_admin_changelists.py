@@ -0,0 +1,61 @@
+import pytest
+
+from blog.choices import category_choices
+from blog.generator import DataGenerator, Scale
+from core.queries import assert_query_budget
+
+pytestmark = [pytest.mark.django_db]
+
+# Session, user, two counts and the page, plus the category and
+# location list filters of posts.
+CHANGELIST_BUDGETS = {
+    "post": 7,
+    "comment": 5,
+    "category": 5,
+    "location": 5,
+}
+
+
+@pytest.fixture
+def thousand_rows():
+    DataGenerator(
+        Scale(
+            users=20,
+            categories=1000,
+            locations=1000,
+            posts=1000,
+            comments_per_post=1,
+        )
+    ).generate()
+
+
+@pytest.mark.parametrize("model", CHANGELIST_BUDGETS)
+def test_changelist_queries_do_not_grow_with_rows(
+    admin_client, thousand_rows, model
+):
+    url = f"/admin/blog/{model}/"
+    # The first request fills the cached choice lists.
+    admin_client.get(url)
+    with assert_query_budget(max_queries=CHANGELIST_BUDGETS[model]):
+        response = admin_client.get(url)
+    assert response.status_code == 200
+
+
+def test_list_editable_choices_are_not_rendered(
+    admin_client, thousand_rows
+):
+    content = admin_client.get("/admin/blog/post/").content.decode()
+    assert content.count("<option") < 2 * 1000, (
+        "Убедитесь, что строки списка постов не выводят все категории"
+        " и местоположения."
+    )
+
+
+def test_cached_choices_follow_changes(mixer):
+    category = mixer.blend("blog.Category", title="Старое", is_published=True)
+    assert (category.pk, "Старое") in category_choices()
+    category.title = "Новое"
+    category.save()
+    assert (category.pk, "Новое") in category_choices(), (
+        "Убедитесь, что список категорий обновляется при их изменении."
+    )
@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from core.queries import QueryRecorder
+
+pytestmark = [pytest.mark.django_db]
+
+
+def post_queries(recorder):
+    return [query.sql for query in recorder.queries if "blog_post" in query.sql]
+
+
+def test_change_page_does_not_load_posts(
+    admin_client, post_with_published_location
+):
+    category = post_with_published_location.category
+    with QueryRecorder() as recorder:
+        response = admin_client.get(
+            f"/admin/blog/category/{category.pk}/change/"
+        )
+    assert response.status_code == 200
+    assert not post_queries(recorder), (
+        "Убедитесь, что страница категории в админке не загружает посты."
+    )
+    assert f"/admin/blog/category/{category.pk}/posts/" in (
+        response.content.decode()
+    )
+
+
+def test_related_posts_are_paginated(
+    admin_client, mixer, monkeypatch, post_with_published_location
+):
+    monkeypatch.setattr("blog.admin.RELATED_POSTS_ON_PAGE", 2)
+    location = post_with_published_location.location
+    mixer.cycle(2).blend("blog.Post", location=location)
+    url = f"/admin/blog/location/{location.pk}/posts/"
+
+    content = admin_client.get(url).content.decode()
+    assert content.count("/admin/blog/post/") == 2
+    next_url = re.search(r'href="([^"]*\?cursor=[^"]+)"', content).group(1)
+    content = admin_client.get(next_url).content.decode()
+    assert content.count("/admin/blog/post/") == 1
+    assert "cursor=" not in content
+
+
+def test_related_posts_need_permission(
+    user_client, post_with_published_location
+):
+    category = post_with_published_location.category
+    response = user_client.get(f"/admin/blog/category/{category.pk}/posts/")
+    assert response.status_code == 302
+
+
+def test_saving_category_does_not_touch_posts(
+    admin_client, post_with_published_location
+):
+    category = post_with_published_location.category
+    with QueryRecorder() as recorder:
+        response = admin_client.post(
+            f"/admin/blog/category/{category.pk}/change/",
+            {
+                "title": "Новое название",
+                "description": category.description,
+                "slug": category.slug,
+                "is_published": "on",
+            },
+        )
+    assert response.status_code == 302
+    category.refresh_from_db()
+    assert category.title == "Новое название"
+    assert not post_queries(recorder), (
+        "Убедитесь, что сохранение категории не затрагивает посты."
+    )
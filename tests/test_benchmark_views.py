@@ -0,0 +1,64 @@
+import argparse
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.benchmarks import VIEW_CASES, Targets, measure_case, parse_repeats
+from core.benchmark import find_regressions
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_view_cases_respond(post_with_published_location):
+    targets = Targets(
+        category=post_with_published_location.category,
+        post=post_with_published_location,
+    )
+    for case in VIEW_CASES:
+        result = measure_case(case, targets, requests=2, warmup=0)
+        assert result["status_code"] in (200, 302), (
+            f"Убедитесь, что страница `{case.url_name}` доступна в бенчмарке."
+        )
+        assert result["p50_ms"] <= result["p99_ms"]
+        if not case.page_cached:
+            assert result["queries"] > 0, (
+                "Убедитесь, что бенчмарк измеряет работу представления,"
+                " а не попадания в кеш страниц."
+            )
+
+
+def _result(p95_samples, queries):
+    return {
+        "key": "10/view/index/anon",
+        "p95_samples": p95_samples,
+        "queries": queries,
+    }
+
+
+def test_noise_is_not_a_regression():
+    baseline = [_result([10.0, 14.0, 9.0, 13.0], 4)]
+    current = [_result([12.0, 15.0, 10.0, 14.0], 4)]
+    assert find_regressions(baseline, current, threshold=0.1) == []
+
+
+def test_slower_views_and_extra_queries_regress():
+    baseline = [_result([10.0, 10.5, 9.5], 4)]
+    current = [_result([20.0, 20.5, 19.5], 6)]
+    regressions = find_regressions(baseline, current, threshold=0.1)
+    assert [regression.metric for regression in regressions] == [
+        "p95 ms",
+        "queries",
+    ]
+    assert "4 -> 6" in str(regressions[1])
+
+
+def test_single_samples_are_rejected(tmp_path):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_repeats("1")
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({"options": {}, "results": [_result([10.0], 4)]})
+    )
+    with pytest.raises(CommandError, match="fewer than 2 samples"):
+        call_command("benchmark_gate", str(baseline))
@@ -0,0 +1,57 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _stored_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_counter_follows_comment_lifecycle(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    assert _stored_count(post) == 3, (
+        "Убедитесь, что счётчик комментариев увеличивается при их создании."
+    )
+
+    comment = Comment.objects.get(pk=comments[0].pk)
+    comment.is_published = False
+    comment.save()
+    assert _stored_count(post) == 2, (
+        "Убедитесь, что снятый с публикации комментарий не учитывается."
+    )
+
+    comment.is_published = True
+    comment.save()
+    Comment.objects.get(pk=comments[1].pk).delete()
+    assert _stored_count(post) == 2
+
+    Comment.objects.filter(post=post).delete()
+    assert _stored_count(post) == 0, (
+        "Убедитесь, что массовое удаление комментариев обновляет счётчик."
+    )
+
+
+def test_post_save_keeps_counter(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post)
+    post.title = "changed"
+    post.save()
+    assert _stored_count(post) == 1, (
+        "Убедитесь, что сохранение публикации не затирает счётчик."
+    )
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command("recount_comments", stdout=StringIO())
+    assert _stored_count(post) == 2
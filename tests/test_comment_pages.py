@@ -0,0 +1,80 @@
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(COMMENTS_PAGE_SIZE=3)
+def test_comments_are_loaded_by_blocks(
+    mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(7).blend("blog.Comment", post=post)
+
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    loaded = [comment.id for comment in page]
+    while page.has_next():
+        response = client.get(
+            f"/posts/{post.id}/comments/", {"cursor": page.next_cursor}
+        )
+        assert response.status_code == 200
+        page = response.context["comments"]
+        loaded.extend(comment.id for comment in page)
+
+    assert loaded == [comment.id for comment in comments], (
+        "Убедитесь, что комментарии подгружаются блоками по порядку"
+        " без пропусков и повторов."
+    )
+
+
+def test_listed_comments_match_comment_count(
+    mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    published = mixer.cycle(2).blend(
+        "blog.Comment", post=post, is_published=True
+    )
+    mixer.blend("blog.Comment", post=post, is_published=False)
+
+    response = client.get(f"/posts/{post.id}/")
+    listed = [comment.id for comment in response.context["comments"]]
+    post.refresh_from_db()
+    assert listed == [comment.id for comment in published], (
+        "Убедитесь, что под постом показываются только опубликованные"
+        " комментарии."
+    )
+    assert post.comment_count == len(listed), (
+        "Убедитесь, что счётчик комментариев совпадает с числом"
+        " показанных комментариев."
+    )
+
+
+def test_comments_of_hidden_post_are_not_shown(
+    mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_anonymous_user_can_not_change_orphaned_comment(
+    mixer, client, post_with_published_location, action
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, text="Исходный текст")
+    comment.author.delete()
+    comment.refresh_from_db()
+    assert comment.author_id is None
+
+    client.post(
+        f"/posts/{post.id}/{action}/{comment.id}/", {"text": "Изменено"}
+    )
+    comment.refresh_from_db()
+    assert comment.text == "Исходный текст", (
+        "Убедитесь, что аноним не может изменить или удалить комментарий"
+        " удалённого пользователя."
+    )
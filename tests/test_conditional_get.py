@@ -0,0 +1,69 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+# Session and user lookups of an authenticated request.
+AUTH_QUERIES = 2
+
+
+def _urls(post):
+    return (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+
+
+def test_not_modified_skips_rendering(
+    user_client, post_with_published_location
+):
+    for url in _urls(post_with_published_location):
+        etag = user_client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f"Убедитесь, что страница {url} отвечает 304 на If-None-Match."
+        )
+        assert not response.templates
+        assert len(queries) <= AUTH_QUERIES + 1, (
+            f"Убедитесь, что ответ 304 для {url} не выполняет основной"
+            " запрос страницы."
+        )
+
+
+def test_not_modified_for_anonymous(client, post_with_published_location):
+    for url in _urls(post_with_published_location):
+        response = client.get(url)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+        assert response.status_code == 304
+        assert len(queries) <= 1
+
+
+def test_changes_produce_new_validators(
+    mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    etags = {url: user_client.get(url)["ETag"] for url in _urls(post)}
+    mixer.blend("blog.Comment", post=post)
+    for url, etag in etags.items():
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f"Убедитесь, что после нового комментария страница {url}"
+            " отдаётся заново."
+        )
+
+
+def test_validators_depend_on_user(
+    user_client, another_user_client, post_with_published_location
+):
+    etag = user_client.get("/")["ETag"]
+    response = another_user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+CURSOR_MODES = {
+    "blog:index": "cursor",
+    "blog:category_posts": "cursor",
+    "blog:profile": "cursor",
+}
+
+
+@pytest.fixture
+def posts_with_equal_dates(mixer, user, published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=mixer.sequence(
+            *([pub_date] * 5 + [pub_date - timedelta(hours=1)] * 18)
+        ),
+    )
+
+
+@override_settings(POSTS_PAGINATION_MODES=CURSOR_MODES)
+def test_cursor_pages_cover_all_posts(
+    user, user_client, posts_with_equal_dates
+):
+    for url in ("/", f"/profile/{user.username}/"):
+        seen = []
+        pages = []
+        response = user_client.get(url)
+        while True:
+            page_obj = response.context["page_obj"]
+            pages.append([post.pk for post in page_obj])
+            seen.extend(pages[-1])
+            if not page_obj.has_next():
+                break
+            response = user_client.get(
+                url, {"cursor": page_obj.next_cursor}
+            )
+        assert len(seen) == len(set(seen)) == len(posts_with_equal_dates), (
+            "Убедитесь, что курсорная пагинация не теряет и не повторяет"
+            " публикации."
+        )
+        assert [len(page) for page in pages] == [N_PER_PAGE, N_PER_PAGE, 3]
+
+        page_obj = response.context["page_obj"]
+        response = user_client.get(url, {"cursor": page_obj.previous_cursor})
+        assert [post.pk for post in response.context["page_obj"]] == pages[1]
+
+
+@override_settings(POSTS_PAGINATION_MODES=CURSOR_MODES)
+def test_invalid_cursor_is_404(user_client):
+    response = user_client.get("/", {"cursor": "garbage"})
+    assert response.status_code == 404
@@ -0,0 +1,53 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = " ".join(f"word{number}" for number in range(100))
+
+
+def test_excerpt_is_stored_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == " ".join(LONG_TEXT.split()[:10]) + " …"
+
+
+def test_lists_do_not_load_text(
+    user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    for url in (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+    ):
+        with CaptureQueriesContext(connection) as queries:
+            content = user_client.get(url).content.decode("utf-8")
+        assert post.excerpt in content
+        assert not any(
+            '"blog_post"."text"' in query["sql"] for query in queries
+        ), f"Убедитесь, что на странице {url} не загружается полный текст."
+
+
+def test_backfill_excerpts(client, post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(excerpt="устаревшая выдержка")
+    assert "устаревшая выдержка" in client.get("/").content.decode("utf-8")
+    call_command("backfill_excerpts", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.excerpt
+    content = client.get("/").content.decode("utf-8")
+    assert "устаревшая выдержка" not in content, (
+        "Убедитесь, что после пересчёта выдержек сбрасывается кеш страниц"
+        " и карточек."
+    )
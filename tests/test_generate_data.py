@@ -0,0 +1,53 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Sum
+
+from blog.models import Comment, Post
+from core.cache import get_versions
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _generate(prefix):
+    call_command(
+        "generate_data",
+        users=5,
+        categories=3,
+        locations=2,
+        posts=50,
+        prefix=prefix,
+        seed=42,
+        stdout=StringIO(),
+    )
+    return list(
+        Post.objects.filter(author__username__startswith=prefix)
+        .order_by("pk")
+        .values_list("title", "comment_count", "is_published")
+    )
+
+
+def test_generated_data_is_reproducible():
+    first = _generate("first")
+    second = _generate("second")
+    assert len(first) == 50
+    assert first == second, (
+        "Убедитесь, что генератор с одинаковым seed создаёт одинаковые данные."
+    )
+
+
+def test_generated_counters_match_comments():
+    _generate("gen")
+    stored = Post.objects.aggregate(total=Sum("comment_count"))["total"]
+    assert stored == Comment.objects.filter(is_published=True).count()
+    assert all(post.excerpt for post in Post.objects.all())
+
+
+def test_generation_invalidates_all_cached_versions():
+    versions = get_versions(["post:1", "category:1", "user:1"])
+    _generate("gen")
+    assert all(
+        new != versions[name]
+        for name, new in get_versions(versions).items()
+    ), "Убедитесь, что генерация данных сбрасывает весь кеш."
@@ -0,0 +1,81 @@
+import json
+import os
+import re
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from core.metrics import REQUEST_DURATION, render_metrics, store
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count(text, name, view):
+    match = re.search(
+        rf'^{name}_count{{view="{re.escape(view)}"}} (\S+)$', text, re.M
+    )
+    return float(match.group(1)) if match else 0
+
+
+def test_requests_are_measured(client, post_with_published_location):
+    before = client.get("/metrics/").content.decode()
+    client.get("/")
+    response = client.get("/metrics/")
+    assert response.status_code == HTTPStatus.OK
+    text = response.content.decode()
+    for name in (
+        "blogicum_request_duration_seconds",
+        "blogicum_sql_queries",
+        "blogicum_template_render_seconds",
+        "blogicum_response_size_bytes",
+    ):
+        assert _count(text, name, "blog:index") == (
+            _count(before, name, "blog:index") + 1
+        ), f"Убедитесь, что метрика `{name}` учитывает запросы к странице."
+    assert 'le="+Inf"' in text
+
+
+def test_metrics_are_internal(client):
+    response = client.get("/metrics/", REMOTE_ADDR="10.0.0.1")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_metrics_of_processes_are_merged(tmp_path):
+    bucket_count = len(REQUEST_DURATION.buckets) + 1
+    other_process = {
+        f"{REQUEST_DURATION.name}\tblog:other": [2] + [0] * bucket_count
+    }
+    (tmp_path / "1.json").write_text(json.dumps(other_process))
+    store.observe(REQUEST_DURATION, "blog:own", 0.2)
+    with override_settings(METRICS_DIR=str(tmp_path)):
+        store.flush(tmp_path)
+        text = render_metrics(store.collect())
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+    assert _count(text, REQUEST_DURATION.name, "blog:other") == 2
+    assert _count(text, REQUEST_DURATION.name, "blog:own") >= 1
+
+
+@override_settings(METRICS_TRUST_INTERNAL_IPS=False, METRICS_TOKENS=["secret"])
+def test_metrics_need_token_when_internal_ips_are_not_trusted(client):
+    assert client.get("/metrics/").status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что без доверия к INTERNAL_IPS метрики закрыты."
+    )
+    response = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+    assert response.status_code == HTTPStatus.OK
+    response = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer wrong")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_expired_snapshots_are_deleted(tmp_path):
+    stale = tmp_path / "1.json"
+    stale.write_text("{}")
+    os.utime(stale, (0, 0))
+    fresh = tmp_path / "2.json"
+    fresh.write_text("{}")
+    with override_settings(METRICS_DIR=str(tmp_path)):
+        store.collect()
+    assert not stale.exists(), (
+        "Убедитесь, что снимки метрик завершившихся процессов удаляются."
+    )
+    assert fresh.exists()
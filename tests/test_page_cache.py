@@ -0,0 +1,121 @@
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from blog.views import Index
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_pages_are_cached(client, post_with_published_location):
+    post = post_with_published_location
+    for url in (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        "/pages/about/",
+    ):
+        first = client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            second = client.get(url)
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert len(queries) == 0, (
+            f"Убедитесь, что страница {url} для анонимного пользователя"
+            " отдаётся из кеша."
+        )
+
+
+@pytest.mark.parametrize("change", ["post", "comment", "category", "location"])
+def test_changes_invalidate_cached_pages(
+    mixer, client, post_with_published_location, change
+):
+    post = post_with_published_location
+    urls = ("/", f"/posts/{post.id}/", f"/category/{post.category.slug}/")
+    for url in urls:
+        client.get(url)
+
+    if change == "post":
+        post.title = "New post title"
+        post.save()
+        expected = post.title
+    elif change == "comment":
+        comment = mixer.blend("blog.Comment", post=post)
+        expected = "(1)"
+        urls = urls[:1]
+    elif change == "category":
+        post.category.title = "New category title"
+        post.category.save()
+        expected = post.category.title
+    else:
+        post.location.name = "New location name"
+        post.location.save()
+        expected = post.location.name
+
+    for url in urls:
+        content = client.get(url).content.decode("utf-8")
+        assert expected in content, (
+            f"Убедитесь, что изменение ({change}) сбрасывает кеш страницы"
+            f" {url}."
+        )
+    if change == "comment":
+        detail = client.get(f"/posts/{post.id}/").content.decode("utf-8")
+        assert f"comment_{comment.id}" in detail
+
+
+def test_unrelated_change_keeps_cache(
+    mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    mixer.blend("blog.Location")
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    assert len(queries) == 0
+
+
+def test_authenticated_pages_are_not_cached(
+    user_client, post_with_published_location
+):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get("/")
+    assert len(queries) > 0
+
+
+def test_page_changed_while_rendering_is_not_cached(
+    client, monkeypatch, post_with_published_location
+):
+    from blog.views import Index
+    from core.cache import bump_versions
+
+    get_queryset = Index.get_queryset
+
+    def get_queryset_and_bump(view):
+        queryset = list(get_queryset(view))
+        bump_versions("unrelated")
+        return queryset
+
+    monkeypatch.setattr(Index, "get_queryset", get_queryset_and_bump)
+    client.get("/")
+    monkeypatch.undo()
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/")
+    assert len(queries) > 0, (
+        "Убедитесь, что страница, данные которой изменились во время"
+        " отрисовки, не попадает в кеш."
+    )
+
+
+def test_page_cache_keys_of_different_queries_differ():
+    keys = set()
+    for query in ("page=1&cursor=2", "page=1%26cursor%3D2", "cursor=2&page=1"):
+        view = Index()
+        view.request = RequestFactory().get(f"/?{query}")
+        keys.add(view.get_page_cache_key())
+    assert len(keys) == 2, (
+        "Убедитесь, что ключ кеша страницы однозначно кодирует параметры"
+        " запроса."
+    )
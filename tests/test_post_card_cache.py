@@ -0,0 +1,45 @@
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from blog.templatetags.blog_tags import card_version
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _card_key(post):
+    return make_template_fragment_key(
+        "post_card", [post.id, card_version(post)]
+    )
+
+
+def test_post_card_is_shared_between_users(
+    user_client, client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    card = cache.get(_card_key(post))
+    assert card and post.title in card, (
+        "Убедитесь, что карточка публикации кешируется."
+    )
+    cache.set(_card_key(post), "cached card")
+    response = client.get(f"/profile/{post.author.username}/")
+    assert "cached card" in response.content.decode("utf-8")
+
+
+def test_post_card_version_changes(mixer, post_with_published_location):
+    post = post_with_published_location
+    versions = {card_version(post)}
+    post.author.username = "renamed"
+    post.author.save()
+    versions.add(card_version(post))
+    mixer.blend("blog.Comment", post=post)
+    versions.add(card_version(post))
+    post.category.save()
+    versions.add(card_version(post))
+    post.location.save()
+    versions.add(card_version(post))
+    assert len(versions) == 5, (
+        "Убедитесь, что версия карточки меняется вместе с публикацией,"
+        " её автором, категорией, местоположением и комментариями."
+    )
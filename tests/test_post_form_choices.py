@@ -0,0 +1,97 @@
+import pytest
+
+from blog.forms import PostForm
+from core.queries import QueryRecorder
+
+pytestmark = [pytest.mark.django_db]
+
+
+def choice_queries(recorder):
+    return [
+        query.sql
+        for query in recorder.queries
+        if "blog_category" in query.sql or "blog_location" in query.sql
+    ]
+
+
+def test_choices_are_cached_and_published_only(mixer):
+    published = mixer.blend("blog.Category", is_published=True)
+    hidden = mixer.blend("blog.Category", is_published=False)
+    PostForm().as_p()
+
+    with QueryRecorder() as recorder:
+        html = PostForm().as_p()
+    assert not choice_queries(recorder), (
+        "Убедитесь, что форма поста берёт категории и местоположения"
+        " из кэша."
+    )
+    assert published.title in html
+    assert hidden.title not in html, (
+        "Убедитесь, что форма поста не предлагает неопубликованные"
+        " категории."
+    )
+
+    published.title = "Новое название"
+    published.save()
+    assert "Новое название" in PostForm().as_p(), (
+        "Убедитесь, что список категорий формы обновляется при их изменении."
+    )
+
+
+def test_unpublished_category_is_rejected(mixer):
+    hidden = mixer.blend("blog.Category", is_published=False)
+    form = PostForm(
+        {
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date": "2024-01-01 10:00",
+            "category": hidden.pk,
+        }
+    )
+    assert not form.is_valid()
+    assert "category" in form.errors
+
+
+def test_delete_page_does_not_build_form(user_client, mixer, user):
+    post = mixer.blend("blog.Post", author=user, title="Удаляемый пост")
+    with QueryRecorder() as recorder:
+        response = user_client.get(f"/posts/{post.pk}/delete/")
+    assert response.status_code == 200
+    assert "form" not in response.context
+    assert post.title in response.content.decode()
+    assert not [
+        sql for sql in choice_queries(recorder) if "blog_category" in sql
+    ], "Убедитесь, что страница удаления поста не загружает категории."
+
+
+def test_edit_keeps_unpublished_location_and_category(
+    user_client, mixer, user
+):
+    location = mixer.blend("blog.Location", is_published=False)
+    category = mixer.blend("blog.Category", is_published=False)
+    post = mixer.blend(
+        "blog.Post", author=user, location=location, category=category
+    )
+
+    form = PostForm(instance=post)
+    html = form.as_p()
+    assert f'value="{location.pk}" selected' in html
+    assert f'value="{category.pk}" selected' in html
+
+    response = user_client.post(
+        f"/posts/{post.pk}/edit/",
+        {
+            "title": "Новый заголовок",
+            "text": post.text,
+            "pub_date": post.pub_date.strftime("%Y-%m-%d %H:%M"),
+            "location": location.pk,
+            "category": category.pk,
+        },
+    )
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.title == "Новый заголовок"
+    assert (post.location_id, post.category_id) == (location.pk, category.pk), (
+        "Убедитесь, что редактирование поста не сбрасывает его"
+        " неопубликованные категорию и местоположение."
+    )
@@ -0,0 +1,39 @@
+import pstats
+
+import pytest
+from django.test import Client, override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def staff_client(mixer):
+    client = Client()
+    client.force_login(mixer.blend("auth.User", is_staff=True))
+    return client
+
+
+def test_staff_request_is_profiled(
+    staff_client, tmp_path, post_with_published_location
+):
+    with override_settings(PROFILER_DIR=tmp_path):
+        response = staff_client.get("/", HTTP_X_PROFILE="1")
+    name = response["X-Profile-Id"]
+    stats = pstats.Stats(str(tmp_path / f"{name}.prof"))
+    assert stats.total_calls > 0
+    collapsed = (tmp_path / f"{name}.collapsed").read_text()
+    for line in collapsed.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.split(";")[0] in ("orm", "template", "view")
+        assert int(count) > 0
+    assert "orm=" in response["X-Profile-Summary"]
+
+
+def test_profiling_needs_staff_or_token(user_client, tmp_path):
+    with override_settings(PROFILER_DIR=tmp_path):
+        response = user_client.get("/", HTTP_X_PROFILE="1")
+        assert "X-Profile-Id" not in response
+        assert not list(tmp_path.iterdir())
+        with override_settings(PROFILER_TOKENS=["secret"]):
+            response = user_client.get("/", HTTP_X_PROFILE="secret")
+    assert (tmp_path / f'{response["X-Profile-Id"]}.prof').exists()
@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+from django.test import override_settings
+
+from blog.models import Comment
+from core import queries
+from core.queries import (
+    QueryBudgetExceeded,
+    assert_query_budget,
+    normalize_sql,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_normalize_sql():
+    assert normalize_sql(
+        "SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s, %s) LIMIT 21"
+    ) == "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?"
+
+
+def test_lazy_relations_are_reported(mixer, post_with_published_location):
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location)
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1: 3 times"):
+        with assert_query_budget():
+            [comment.author.username for comment in Comment.objects.all()]
+
+    with assert_query_budget(max_queries=1):
+        [
+            comment.author.username
+            for comment in Comment.objects.select_related("author")
+        ]
+
+
+def test_view_budget_is_enforced(client, post_with_published_location):
+    with override_settings(QUERY_BUDGETS={"blog:index": 1}):
+        with pytest.raises(QueryBudgetExceeded, match="budget is 1"):
+            client.get("/")
+
+
+def test_view_budget_is_logged_when_not_strict(
+    client, caplog, post_with_published_location
+):
+    with override_settings(
+        QUERY_BUDGETS={"blog:index": 1}, QUERY_BUDGETS_STRICT=False
+    ):
+        with caplog.at_level(logging.WARNING, logger="core.queries"):
+            response = client.get("/")
+    assert response.status_code == 200
+    assert "blog:index" in caplog.text
+
+
+def test_view_budget_is_not_checked_when_disabled(
+    client, post_with_published_location
+):
+    with override_settings(
+        QUERY_BUDGETS={"blog:index": 1}, QUERY_BUDGETS_ENABLED=False
+    ):
+        response = client.get("/")
+    assert response.status_code == 200
+
+
+def test_view_budget_is_counted_without_callers(
+    client, caplog, monkeypatch, post_with_published_location
+):
+    def find_caller():
+        raise AssertionError("Вызывающий код не должен искаться.")
+
+    monkeypatch.setattr(queries, "find_caller", find_caller)
+    with override_settings(
+        QUERY_BUDGETS={"blog:index": 1},
+        QUERY_BUDGETS_STRICT=False,
+        QUERY_BUDGETS_FIND_CALLERS=False,
+    ):
+        with caplog.at_level(logging.WARNING, logger="core.queries"):
+            response = client.get("/")
+    assert response.status_code == 200
+    assert "budget is 1" in caplog.text, (
+        "Убедитесь, что без поиска вызывающего кода бюджет запросов"
+        " всё равно проверяется."
+    )
@@ -0,0 +1,33 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_queries_use_indexes():
+    call_command("check_query_plans", stdout=StringIO())
+
+
+def test_post_indexes_are_not_redundant():
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, "blog_post"
+        )
+    indexes = [
+        tuple(constraint["columns"])
+        for constraint in constraints.values()
+        if constraint["index"] and not constraint["primary_key"]
+    ]
+    redundant = [
+        (index, other)
+        for number, index in enumerate(indexes)
+        for other in indexes[:number] + indexes[number + 1 :]
+        if other[: len(index)] == index
+    ]
+    assert not redundant, (
+        "Убедитесь, что индексы публикаций не дублируют начало других"
+        f" индексов: {redundant}"
+    )
@@ -0,0 +1,125 @@
+import random
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.test import override_settings
+
+from blog.templatetags.blog_tags import card_version
+from core.routers import ReplicaRouter
+
+pytestmark = [pytest.mark.django_db]
+
+
+def aliases(reads):
+    return {alias for _, alias in reads}
+
+
+@pytest.fixture
+def routed_reads(monkeypatch):
+    # The default database stands in for a replica, reads not routed
+    # by the router are recorded as None, along with labels of models.
+    reads = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def record(self, model, **hints):
+        alias = db_for_read(self, model, **hints)
+        reads.append((model._meta.label, alias))
+        return alias
+
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", record)
+    with override_settings(DATABASE_REPLICAS=["default"]):
+        yield reads
+
+
+def test_read_only_views_read_from_one_replica(
+    client, routed_reads, monkeypatch, post_with_published_location
+):
+    choices = []
+    choice = random.choice
+
+    def record(items):
+        if items == settings.DATABASE_REPLICAS:
+            choices.append(items)
+        return choice(items)
+
+    monkeypatch.setattr(random, "choice", record)
+    client.get("/search/", {"q": post_with_published_location.title})
+    assert routed_reads and aliases(routed_reads) == {"default"}, (
+        "Убедитесь, что страница поиска читает данные с реплики."
+    )
+    assert len(choices) == 1, (
+        "Убедитесь, что все чтения запроса идут с одной реплики."
+    )
+
+
+@pytest.mark.parametrize("url", ["/", "/posts/{pk}/", "/profile/{username}/"])
+def test_post_views_read_from_replica(
+    client, routed_reads, post_with_published_location, url
+):
+    post = post_with_published_location
+    client.get(url.format(pk=post.pk, username=post.author.username))
+    post_reads = [
+        (label, alias) for label, alias in routed_reads if label != "auth.User"
+    ]
+    assert post_reads and aliases(post_reads) == {"default"}, (
+        "Убедитесь, что лента, посты и профили читают данные с реплики."
+    )
+
+
+def test_sessions_and_users_are_read_from_primary(
+    user_client, routed_reads, post_with_published_location
+):
+    user_client.get("/")
+    read_models = {label for label, _ in routed_reads}
+    assert {"sessions.Session", "auth.User"} <= read_models
+    assert {
+        alias
+        for label, alias in routed_reads
+        if label in ("sessions.Session", "auth.User")
+    } == {None}, (
+        "Убедитесь, что сессии и пользователи читаются с основной базы,"
+        " а не с отстающей реплики."
+    )
+    assert "default" in aliases(routed_reads)
+
+
+def test_replica_reads_are_not_cached(
+    client, routed_reads, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    assert cache.get("page:/?") is None, (
+        "Убедитесь, что страницы, прочитанные с реплики, не кешируются."
+    )
+    fragment_key = make_template_fragment_key(
+        "post_card", [post.pk, card_version(post)]
+    )
+    assert cache.get(fragment_key) is None, (
+        "Убедитесь, что карточки постов, прочитанные с реплики,"
+        " не кешируются."
+    )
+
+
+def test_other_views_read_from_primary(
+    user_client, routed_reads, post_with_published_location
+):
+    user_client.get(f"/posts/{post_with_published_location.pk}/edit/")
+    assert routed_reads and aliases(routed_reads) == {None}
+
+
+def test_reads_are_pinned_to_primary_after_write(
+    user_client, routed_reads, post_with_published_location
+):
+    post_id = post_with_published_location.pk
+    response = user_client.post(
+        f"/posts/{post_id}/comment/", {"text": "Комментарий"}
+    )
+    assert settings.REPLICA_PIN_COOKIE in response.cookies, (
+        "Убедитесь, что после записи чтения закрепляются за основной базой."
+    )
+
+    routed_reads.clear()
+    user_client.get("/search/", {"q": "запрос"})
+    assert routed_reads and aliases(routed_reads) == {None}
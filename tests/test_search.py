@@ -0,0 +1,128 @@
+import re
+
+import pytest
+from django.db import connection
+
+from blog.checks import check_search_triggers
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def found_titles(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == 200
+    return [post.title for post in response.context["page_obj"]], response
+
+
+@pytest.fixture
+def posts(mixer, post_with_published_location):
+    def blend(title, text, **kwargs):
+        fields = {
+            "category": post_with_published_location.category,
+            "pub_date": post_with_published_location.pub_date,
+            "is_published": True,
+            **kwargs,
+        }
+        return mixer.blend("blog.Post", title=title, text=text, **fields)
+
+    return blend
+
+
+def test_matches_prefixes_and_ranks_titles_higher(client, posts):
+    posts("Прогулка", "Летом мы ездили на Море и купались.")
+    posts("Морские виды", "Фотографии с берега.")
+    posts("Горы", "Ни слова о воде.")
+
+    titles, response = found_titles(client, "мор")
+    assert titles == ["Морские виды", "Прогулка"], (
+        "Убедитесь, что поиск находит слова по началу и выше ставит"
+        " совпадения в заголовке."
+    )
+    assert "<mark>Море</mark>" in response.content.decode(), (
+        "Убедитесь, что в результатах поиска выделяются совпадения."
+    )
+
+
+def test_hides_unpublished_posts(client, posts, mixer):
+    posts("Видимый пост", "текст")
+    posts("Скрытый пост", "текст", is_published=False)
+    unpublished_category = mixer.blend("blog.Category", is_published=False)
+    posts("Пост в скрытой категории", "текст", category=unpublished_category)
+
+    titles, _ = found_titles(client, "пост")
+    assert titles == ["Видимый пост"], (
+        "Убедитесь, что поиск показывает только опубликованные посты."
+    )
+
+
+def test_operators_in_query_are_plain_words(client, posts):
+    posts("Кошки", 'Текст про "кошек" AND собак')
+    for query in ['"', "AND", "кош* OR", "NEAR(", ""]:
+        client.get("/search/", {"q": query})
+    titles, _ = found_titles(client, 'кош" AND')
+    assert titles == ["Кошки"]
+
+
+def test_results_are_paginated_by_cursor(client, posts):
+    for number in range(12):
+        posts(f"Заметка {number}", "дневник " * (number + 1))
+
+    first, response = found_titles(client, "дневник")
+    assert len(first) == 10
+    content = response.content.decode()
+    next_url = re.search(r'href="(\?[^"]*cursor=[^"]+)"', content).group(1)
+    assert "q=" in next_url, (
+        "Убедитесь, что ссылки пагинации сохраняют поисковый запрос."
+    )
+    response = client.get(f"/search/{next_url.replace('&amp;', '&')}")
+    second = [post.title for post in response.context["page_obj"]]
+    assert len(second) == 2
+    assert not set(first) & set(second)
+
+
+def test_index_follows_post_changes(posts):
+    post = posts("Черновик", "первоначальный текст")
+    post.title = "Чистовик"
+    post.save()
+    assert list(Post.objects.search("черновик")) == []
+    assert list(Post.objects.search("чистовик")) == [post]
+
+    Post.objects.filter(pk=post.pk).delete()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM blog_post_fts WHERE blog_post_fts MATCH ?",
+            ["первоначальный"],
+        )
+        assert cursor.fetchone() == (0,), (
+            "Убедитесь, что удалённые посты удаляются из поискового индекса."
+        )
+
+
+def test_admin_search_uses_index(admin_client, posts):
+    posts("Первый", "про рыбалку")
+    posts("Второй", "про охоту")
+    response = admin_client.get("/admin/blog/post/", {"q": "рыбал"})
+    titles = [post.title for post in response.context["cl"].result_list]
+    assert titles == ["Первый"]
+
+
+def test_missing_index_triggers_are_reported():
+    assert check_search_triggers(None, databases=["default"]) == []
+
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TRIGGER blog_post_fts_update")
+    errors = check_search_triggers(None, databases=["default"])
+    assert [error.id for error in errors] == ["blog.E001"], (
+        "Убедитесь, что системная проверка находит пропавшие триггеры"
+        " поискового индекса."
+    )
+    assert "blog_post_fts_update" in errors[0].msg
+
+
+def test_index_is_matched_once():
+    sql = str(Post.objects.search("море").query)
+    assert sql.count("MATCH") == 1, (
+        "Убедитесь, что поисковый индекс присоединяется к постам один раз,"
+        " а ранг и фрагмент берутся из того же совпадения."
+    )
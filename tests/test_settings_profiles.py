@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.test import override_settings
+
+from core.checks import check_production_settings
+
+PROJECT_DIR = Path(settings.BASE_DIR)
+
+
+def _run_with_profile(profile, code, **env):
+    return subprocess.run(
+        [sys.executable, "-c", f"import django; django.setup(); {code}"],
+        cwd=PROJECT_DIR,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "blogicum.settings",
+            "DJANGO_SETTINGS_PROFILE": profile,
+            **env,
+        },
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_production_profile():
+    result = _run_with_profile(
+        "production",
+        "from django.conf import settings as s;"
+        "print(s.DEBUG, 'debug_toolbar' in s.INSTALLED_APPS,"
+        " s.TEMPLATES[0]['OPTIONS']['loaders'][0][0],"
+        " s.DATABASES['default']['CONN_MAX_AGE'] > 0,"
+        " s.STATICFILES_STORAGE.rsplit('.', 1)[1])",
+        DJANGO_SECRET_KEY="secret",
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == [
+        "False",
+        "False",
+        "django.template.loaders.cached.Loader",
+        "True",
+        "ManifestStaticFilesStorage",
+    ]
+
+
+def test_production_refuses_debug_components():
+    with override_settings(SETTINGS_PROFILE="production", DEBUG=True):
+        ids = {error.id for error in check_production_settings(None)}
+    assert {"core.E001", "core.E002", "core.E003"} <= ids
+    assert check_production_settings(None) == []
+
+
+def test_production_refuses_process_cache():
+    caches = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+        }
+    }
+    with override_settings(SETTINGS_PROFILE="production", CACHES=caches):
+        ids = {error.id for error in check_production_settings(None)}
+    assert "core.E006" in ids, (
+        "Убедитесь, что в production нельзя включить кеш отдельного процесса."
+    )
+
+
+def test_production_profile_passes_its_checks():
+    result = _run_with_profile(
+        "production",
+        "from core.checks import check_production_settings as check;"
+        "print([error.id for error in check(None)])",
+        DJANGO_SECRET_KEY="secret",
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+def test_profiler_is_enabled_in_development_only():
+    for profile, expected in (("production", "False"), ("development", "True")):
+        result = _run_with_profile(
+            profile,
+            "from django.conf import settings as s; print(s.PROFILER_ENABLED)",
+            DJANGO_SECRET_KEY="secret",
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == expected
+
+
+def test_query_budgets_are_logged_in_production():
+    result = _run_with_profile(
+        "production",
+        "from django.conf import settings as s; print("
+        "s.QUERY_BUDGETS_ENABLED, s.QUERY_BUDGETS_STRICT,"
+        " s.QUERY_BUDGETS_FIND_CALLERS)",
+        DJANGO_SECRET_KEY="secret",
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["True", "False", "False"], (
+        "Убедитесь, что в production превышения бюджетов запросов"
+        " записываются в журнал без поиска вызывающего кода."
+    )
+
+
+def test_production_profiler_is_configured_by_environment():
+    result = _run_with_profile(
+        "production",
+        "from django.conf import settings as s;"
+        " print(s.PROFILER_ENABLED, s.PROFILER_TOKENS)",
+        DJANGO_SECRET_KEY="secret",
+        DJANGO_PROFILER_ENABLED="1",
+        DJANGO_PROFILER_TOKENS="first,second",
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "True ['first', 'second']", (
+        "Убедитесь, что в production профилировщик включается"
+        " переменными окружения."
+    )
@@ -0,0 +1,56 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_slow_queries_are_logged(client, tmp_path, post_with_published_location):
+    log = tmp_path / "slow.jsonl"
+    with override_settings(SLOW_QUERY_THRESHOLD=0, SLOW_QUERY_LOG=log):
+        client.get(
+            f"/category/{post_with_published_location.category.slug}/"
+        )
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    entries = [
+        entry for entry in entries if entry["view"] == "blog:category_posts"
+    ]
+    assert entries, "Убедитесь, что медленные запросы записываются в журнал."
+    select = next(
+        entry for entry in entries if entry["sql"].startswith("SELECT")
+    )
+    assert select["plan"]
+    assert select["function"].startswith("blog/")
+    assert select["duration_ms"] >= 0
+
+    output = StringIO()
+    call_command("slow_queries", path=log, stdout=output)
+    assert "ms total" in output.getvalue()
+
+
+def test_fast_queries_are_not_logged(client, tmp_path):
+    log = tmp_path / "slow.jsonl"
+    with override_settings(SLOW_QUERY_THRESHOLD=60, SLOW_QUERY_LOG=log):
+        client.get("/")
+    assert not log.exists()
+
+
+def test_truncated_log_lines_are_skipped(tmp_path):
+    log = tmp_path / "slow.jsonl"
+    entry = {
+        "sql": "SELECT 1",
+        "duration_ms": 150.0,
+        "function": "blog/views.py:1 index",
+        "view": "blog:index",
+        "plan": [],
+    }
+    log.write_text(json.dumps(entry) + "\n\n" + json.dumps(entry)[:20])
+
+    output = StringIO()
+    call_command("slow_queries", path=log, stdout=output)
+    assert "150.0 ms total, 1 times" in output.getvalue(), (
+        "Убедитесь, что обрезанные строки журнала пропускаются."
+    )
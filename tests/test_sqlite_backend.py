@@ -0,0 +1,69 @@
+import pytest
+from django.db import OperationalError, connection
+
+from core.backends.sqlite3.base import DatabaseWrapper, get_writer_lock
+
+
+def make_wrapper(path, **options):
+    settings_dict = {
+        **connection.settings_dict,
+        "NAME": str(path),
+        "OPTIONS": options,
+    }
+    return DatabaseWrapper(settings_dict, alias="sqlite_backend_test")
+
+
+@pytest.fixture(autouse=True)
+def unblock_database(django_db_blocker):
+    # Connections are made to separate files, not to the test database.
+    with django_db_blocker.unblock():
+        yield
+
+
+def test_pragmas_are_applied(tmp_path):
+    wrapper = make_wrapper(
+        tmp_path / "db.sqlite3",
+        pragmas={"journal_mode": "wal", "busy_timeout": 1234},
+    )
+    try:
+        with wrapper.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            assert cursor.fetchone()[0] == "wal"
+            cursor.execute("PRAGMA busy_timeout")
+            assert cursor.fetchone()[0] == 1234
+    finally:
+        wrapper.close()
+
+
+def test_writes_are_serialized(tmp_path):
+    path = tmp_path / "db.sqlite3"
+    first = make_wrapper(path, serialize_writes=True)
+    second = make_wrapper(path, serialize_writes=True, timeout=0.1)
+    lock = get_writer_lock(str(path))
+    try:
+        with first.cursor() as cursor:
+            cursor.execute("CREATE TABLE item (id integer)")
+        assert not lock.locked(), (
+            "Убедитесь, что очередь записи освобождается после автокоммита."
+        )
+
+        first.set_autocommit(False)
+        with first.cursor() as cursor:
+            cursor.execute("INSERT INTO item VALUES (1)")
+        assert lock.locked(), (
+            "Убедитесь, что очередь записи занята до конца транзакции."
+        )
+
+        # Lock is not reentrant, so another connection waits even here.
+        with pytest.raises(OperationalError, match="writer queue"):
+            with second.cursor() as cursor:
+                cursor.execute("INSERT INTO item VALUES (2)")
+
+        first.commit()
+        assert not lock.locked()
+        with first.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM item")
+            assert cursor.fetchone()[0] == 1
+    finally:
+        first.close()
+        second.close()
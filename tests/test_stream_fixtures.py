@@ -0,0 +1,103 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+from core.cache import get_versions
+from core.fixtures import JSONArrayReader
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 65536])
+def test_json_array_is_read_incrementally(read_size):
+    items = [
+        {"model": "blog.post", "fields": {"text": "[x], {y} \"z\" \\"}},
+        12345,
+        "строка",
+        [],
+        None,
+    ]
+    text = json.dumps(items, indent=2, ensure_ascii=False)
+    assert list(JSONArrayReader(StringIO(text), read_size)) == items
+    assert list(JSONArrayReader(StringIO(" [ ] "), read_size)) == []
+
+
+def test_dump_and_load_round_trip(mixer, tmp_path, post_with_published_location):
+    mixer.cycle(4).blend(
+        "blog.Post",
+        category=post_with_published_location.category,
+        location=post_with_published_location.location,
+    )
+    # JSON keeps milliseconds of creation times, like dumpdata does.
+    fields = [
+        field.attname for field in Post._meta.concrete_fields
+        if field.name != "created_at"
+    ]
+    expected = list(Post.objects.order_by("pk").values(*fields))
+    fixture = tmp_path / "dump.json.gz"
+    call_command("stream_dumpdata", "blog", output=fixture, stdout=StringIO())
+
+    Post.objects.all().delete()
+    call_command(
+        "stream_loaddata",
+        fixture,
+        chunk_size=2,
+        batch_size=1,
+        stdout=StringIO(),
+    )
+    assert list(Post.objects.order_by("pk").values(*fields)) == expected, (
+        "Убедитесь, что загрузка восстанавливает выгруженные объекты."
+    )
+
+    Post.objects.all().delete()
+    output = StringIO()
+    call_command("stream_loaddata", fixture, offset=3, stdout=output)
+    assert Post.objects.count() == len(expected) - 1, (
+        "Убедитесь, что загрузка продолжается с заданного смещения."
+    )
+    assert "resume with --offset" in output.getvalue()
+
+
+def test_dump_to_stdout_and_load_invalidates_cache(
+    tmp_path, post_with_published_location
+):
+    output = StringIO()
+    call_command("stream_dumpdata", "blog.post", stdout=output)
+    items = json.loads(output.getvalue())
+    assert [item["pk"] for item in items] == [post_with_published_location.pk]
+
+    fixture = tmp_path / "posts.json"
+    fixture.write_text(output.getvalue(), encoding="utf-8")
+    versions = get_versions(["posts"])
+    call_command("stream_loaddata", fixture, stdout=StringIO())
+    assert get_versions(versions) != versions, (
+        "Убедитесь, что загрузка объектов сбрасывает кеш."
+    )
+
+
+def test_load_fills_derived_post_columns(
+    mixer, tmp_path, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post, is_published=True)
+    output = StringIO()
+    call_command("stream_dumpdata", "blog", stdout=output)
+    items = json.loads(output.getvalue())
+    for item in items:
+        if item["model"] == "blog.post":
+            item["fields"].update(excerpt="", comment_count=0)
+    fixture = tmp_path / "old.json"
+    fixture.write_text(json.dumps(items), encoding="utf-8")
+
+    Post.objects.all().delete()
+    call_command("stream_loaddata", fixture, chunk_size=1, stdout=StringIO())
+    loaded = Post.objects.get(pk=post.pk)
+    assert loaded.excerpt == post.excerpt, (
+        "Убедитесь, что при загрузке вычисляются выдержки постов."
+    )
+    assert loaded.comment_count == 2, (
+        "Убедитесь, что при загрузке пересчитываются счётчики комментариев."
+    )